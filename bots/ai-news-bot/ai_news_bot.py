@@ -7,34 +7,147 @@ Covers AI research, product launches, industry news, and breakthroughs.
 """
 
 import os
+import re
 import sys
 import time
 import json
 import logging
 import argparse
+import urllib.parse
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Set, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
 
 import yaml
 import zulip
 from dotenv import load_dotenv
+from lxml import etree
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.common import (
+    PostQueue,
+    conditional_headers,
+    load_validators,
+    make_item_id,
+    remember_validators,
+    save_validators,
+    state_dir,
+)
+from shared.rate_limit import TokenBucket
+from shared.seen_filter import BloomFilter
 
 # Load .env file from script directory
 load_dotenv(Path(__file__).parent / ".env")
 
+# Maximum number of feed/search requests in flight at once
+FETCH_WORKERS = 8
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+
+def _rss_item_key(item) -> Optional[Tuple[str, str]]:
+    """Return (title, link) for an RSS 2.0 item, or None if either is missing."""
+    title = item.findtext("title")
+    link = item.findtext("link")
+    if title is None or not link:
+        return None
+    return title, link
+
+
+def _rss_item_date(item) -> Optional[datetime]:
+    """Return an RSS item's pubDate, or None if it has none."""
+    pub_date_str = item.findtext("pubDate")
+    if not pub_date_str:
+        return None
+    try:
+        # RFC 2822 format: "Wed, 02 Oct 2002 13:00:00 GMT"
+        return parsedate_to_datetime(pub_date_str)
+    except (TypeError, ValueError):
+        # Some feeds put ISO 8601 dates in pubDate
+        if "T" not in pub_date_str:
+            raise
+        return datetime.fromisoformat(pub_date_str.replace("Z", "+00:00"))
+
+
+def _rss_item_description(item) -> str:
+    """Return an RSS item's description, or an empty string."""
+    return item.findtext("description") or ""
+
+
+def _atom_entry_key(entry) -> Optional[Tuple[str, str]]:
+    """Return (title, link) for an Atom entry, or None if either is missing."""
+    title = entry.findtext(f"{ATOM_NS}title")
+    link_elem = entry.find(f"{ATOM_NS}link")
+    if title is None or link_elem is None:
+        return None
+    link = link_elem.text or link_elem.get("href")
+    if not link:
+        return None
+    return title, link
+
+
+def _atom_entry_date(entry) -> Optional[datetime]:
+    """Return an Atom entry's published (or updated) time, or None if it has neither."""
+    pub_date_str = entry.findtext(f"{ATOM_NS}published") or entry.findtext(f"{ATOM_NS}updated")
+    if not pub_date_str:
+        return None
+    # RFC 3339 format: "2002-10-02T13:00:00Z"
+    return datetime.fromisoformat(pub_date_str.replace("Z", "+00:00"))
+
+
+def _atom_entry_description(entry) -> str:
+    """Return an Atom entry's summary (or content), or an empty string."""
+    return entry.findtext(f"{ATOM_NS}summary") or entry.findtext(f"{ATOM_NS}content") or ""
+
+
+# Item tag and per-item readers for each feed format. A feed's format is
+# detected once and its readers used for every item, so the item loop never
+# has to consider the other format.
+RSS_FORMAT = {
+    "item": "item",
+    "key": _rss_item_key,
+    "date": _rss_item_date,
+    "description": _rss_item_description,
+}
+ATOM_FORMAT = {
+    "item": f"{ATOM_NS}entry",
+    "key": _atom_entry_key,
+    "date": _atom_entry_date,
+    "description": _atom_entry_description,
+}
+
+
+def _feed_format(root) -> dict:
+    """Pick the item readers for a parsed feed's format."""
+    return ATOM_FORMAT if root.tag == f"{ATOM_NS}feed" else RSS_FORMAT
+
 
 class AINewsBot:
     """Bot that monitors web sources for AI ecosystem news and posts to Zulip."""
 
     def __init__(self, config_path: str):
         self.script_dir = Path(__file__).parent
+        self.state_dir = state_dir(self.script_dir)
         self.config = self._load_config(config_path)
         self._setup_logging()
         self.logger = logging.getLogger("ai_news_bot")
         self.zulip_client = self._create_zulip_client()
+        # Zulip allows roughly 200 requests/minute per bot; stay under it
+        self.zulip_rate_limit = TokenBucket.per_minute(
+            self.config.get("zulip", {}).get("posts_per_minute", 180)
+        )
+        self.http = self._create_http_session()
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
         self.seen_items = self._load_seen_items()
+        self.validators_file = self.state_dir / "http_cache.json"
+        self.validators = load_validators(self.validators_file, self.logger)
+        self.post_queue = PostQueue(self._send_to_zulip, self.seen_items.add, self.logger)
+        self.category_patterns = self._build_category_patterns()
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
@@ -80,56 +193,105 @@ class AINewsBot:
         self.logger.info(f"Created Zulip client for {zulip_config['site']}")
         return client
 
-    def _load_seen_items(self) -> Set[str]:
-        """Load set of already-seen item IDs from disk."""
-        seen_file = self.script_dir / "seen_items.json"
-        if seen_file.exists():
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session so repeated hosts reuse connections."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _fetch(self, url: str, parse_xml: bool = False):
+        """Conditionally GET a URL, returning (response, root).
+
+        With parse_xml, the body is parsed straight off the connection rather
+        than first being buffered as response.content, and root is the
+        document element. root is None for 304 responses or without parse_xml.
+        """
+        with self.http.get(url, headers=conditional_headers(self.validators, url), timeout=10, stream=parse_xml) as response:
+            if not parse_xml or response.status_code == 304:
+                return response, None
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # A parser per fetch: lxml serializes concurrent use of one parser
+            # across threads. Tolerate malformed feed items instead of aborting
+            # the whole feed, and never resolve external entities
+            parser = etree.XMLParser(recover=True, resolve_entities=False, huge_tree=False)
+            return response, etree.parse(response.raw, parser).getroot()
+
+    def _fetch_concurrently(self, urls: Dict[str, str], parse_xml: bool = False):
+        """Start fetching all URLs now and return an iterator of (key, url, future).
+
+        Requests are submitted immediately, so fetches for several sources
+        can be started before any of them is consumed. The iterator yields
+        in completion order; callers call future.result() inside their own
+        error handling so a failed fetch is reported against the feed or
+        keyword it belongs to. Each future resolves to _fetch's (response, root).
+        """
+        futures = {
+            self.executor.submit(self._fetch, url, parse_xml): (key, url)
+            for key, url in urls.items()
+        }
+        return ((*futures[future], future) for future in as_completed(futures))
+
+    def _load_seen_items(self) -> BloomFilter:
+        """Map the filter of already-seen item IDs from disk."""
+        bloom_file = self.state_dir / "seen_items.bloom"
+        try:
+            seen = BloomFilter.open(bloom_file)
+            self.logger.info(f"Loaded {len(seen)} seen items from disk")
+        except Exception as e:
+            self.logger.warning(f"Failed to load seen items, starting a new filter: {e}")
+            seen = BloomFilter.create(bloom_file)
+
+        # Migrate IDs from the old JSON list format into a new filter. The file
+        # is read from the state directory, so under Docker Compose it has to
+        # be copied into state/ once; without BOT_STATE_DIR that is the bot's
+        # own directory, where it always lived
+        legacy_file = self.state_dir / "seen_items.json"
+        if len(seen) == 0 and legacy_file.is_file():
             try:
-                with open(seen_file, "r") as f:
-                    data = json.load(f)
-                    seen = set(data.get("items", []))
-                    self.logger.info(f"Loaded {len(seen)} seen items from disk")
-                    return seen
+                with open(legacy_file, "r") as f:
+                    for item_id in json.load(f).get("items", []):
+                        seen.add(item_id)
+                self.logger.info(f"Migrated {len(seen)} seen items from {legacy_file.name}")
             except Exception as e:
-                self.logger.warning(f"Failed to load seen items: {e}")
-        return set()
+                self.logger.warning(f"Failed to migrate seen items: {e}")
+
+        return seen
 
     def _save_seen_items(self):
-        """Save seen item IDs to disk."""
-        seen_file = self.script_dir / "seen_items.json"
+        """Write the seen-items filter's changed pages back to disk."""
         try:
-            # Keep only the most recent 2000 items to prevent unbounded growth
-            items_to_save = list(self.seen_items)[-2000:]
-            with open(seen_file, "w") as f:
-                json.dump({"items": items_to_save, "last_updated": datetime.now(timezone.utc).isoformat()}, f, indent=2)
-            self.logger.debug(f"Saved {len(items_to_save)} seen items to disk")
+            self.seen_items.flush()
+            self.logger.debug(f"Saved {len(self.seen_items)} seen items to disk")
         except Exception as e:
             self.logger.error(f"Failed to save seen items: {e}")
 
-    def _matches_keywords(self, text: str, keywords: List[str]) -> bool:
-        """Check if text matches any of the keywords (case-insensitive)."""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in keywords)
+    def _build_category_patterns(self) -> Dict[str, re.Pattern]:
+        """Compile one case-insensitive alternation per category, preserving config order."""
+        categories = self.config.get("categories", {})
+        return {
+            category_name: re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+            for category_name, category_data in categories.items()
+            for keywords in [category_data.get("keywords", [])]
+            if keywords
+        }
 
     def _categorize_item(self, title: str, body: str = "") -> str:
         """Determine category based on keywords in title/body."""
-        combined = f"{title} {body}".lower()
+        combined = f"{title} {body}"
 
-        categories = self.config.get("categories", {})
-
-        # Check each category's keywords
-        for category_name, category_data in categories.items():
-            keywords = category_data.get("keywords", [])
-            if self._matches_keywords(combined, keywords):
+        # Check each category's keywords with a single scan per category
+        for category_name, pattern in self.category_patterns.items():
+            if pattern.search(combined):
                 return category_name
 
         # Default category
         return self.config.get("default_category", "General")
 
-    def _post_to_zulip(self, category: str, content: str):
-        """Post news item to Zulip."""
+    def _queue_to_zulip(self, category: str, content: str, item_id: str):
+        """Queue a news item to be posted with the rest of its topic, marking it seen once posted."""
         zulip_config = self.config.get("zulip", {})
         stream = zulip_config.get("stream", "ai-news")
 
@@ -137,6 +299,11 @@ class AINewsBot:
         categories = self.config.get("categories", {})
         topic = categories.get(category, {}).get("topic", category)
 
+        self.post_queue.add(stream, topic, content, item_id)
+
+    def _send_to_zulip(self, stream: str, topic: str, content: str) -> bool:
+        """Send a single message to a Zulip stream/topic, returning whether it was posted."""
+        self.zulip_rate_limit.acquire()
         result = self.zulip_client.send_message({
             "type": "stream",
             "to": stream,
@@ -146,88 +313,105 @@ class AINewsBot:
 
         if result.get("result") != "success":
             self.logger.error(f"Failed to send to Zulip: {result}")
-        else:
-            self.logger.info(f"Posted to #{stream} > {topic}")
-
-    def check_rss_feeds(self):
-        """Check RSS feeds for AI news."""
+            return False
+        self.logger.info(f"Posted to #{stream} > {topic}")
+        return True
+
+    def _rss_feed_urls(self) -> Dict[str, str]:
+        """Return {feed name: URL} for the RSS feeds source, if enabled."""
+        rss_config = self.config.get("sources", {}).get("rss_feeds", {})
+        if not rss_config.get("enabled", False):
+            return {}
+        return rss_config.get("feeds", {})
+
+    def _hackernews_urls(self) -> Dict[str, str]:
+        """Return {keyword: Algolia search URL} for the Hacker News source, if enabled."""
+        hn_config = self.config.get("sources", {}).get("hackernews", {})
+        if not hn_config.get("enabled", False):
+            return {}
+
+        # Use Algolia HN Search API
+        base_url = "https://hn.algolia.com/api/v1/search"
+        urls = {}
+        for keyword in hn_config.get("keywords", []):
+            params = {
+                "query": keyword,
+                "tags": "story",
+                "hitsPerPage": 10,
+            }
+            urls[keyword] = f"{base_url}?{urllib.parse.urlencode(params)}"
+        return urls
+
+    def _google_news_urls(self) -> Dict[str, str]:
+        """Return {keyword: Google News RSS URL} for the Google News source, if enabled."""
+        google_config = self.config.get("sources", {}).get("google_news", {})
+        if not google_config.get("enabled", False):
+            return {}
+
+        # Google News RSS feed for each search term (URL-encoded)
+        return {
+            keyword: f"https://news.google.com/rss/search?q={urllib.parse.quote(keyword)}&hl=en-US&gl=US&ceid=US:en"
+            for keyword in google_config.get("keywords", [])
+        }
+
+    def check_rss_feeds(self, fetches):
+        """Process fetched RSS feeds for AI news."""
         if not self.config.get("sources", {}).get("rss_feeds", {}).get("enabled", False):
             return
 
         rss_config = self.config["sources"]["rss_feeds"]
-        feeds = rss_config.get("feeds", {})
+        max_age_hours = rss_config.get("max_age_hours", 168)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for feed_name, feed_url in feeds.items():
-            try:
-                response = requests.get(feed_url, timeout=10)
-                response.raise_for_status()
+        # Bind per-item lookups once; the loops below run for every feed item
+        seen = self.seen_items
+        queued = self.post_queue
+        categorize = self._categorize_item
+        queue = self._queue_to_zulip
 
-                # Parse RSS feed
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
-
-                # Handle both RSS and Atom feeds
-                items = root.findall(".//item") or root.findall(".//{http://www.w3.org/2005/Atom}entry")
-
-                for item in items:
-                    # Handle RSS format
-                    title_elem = item.find("title") or item.find("{http://www.w3.org/2005/Atom}title")
-                    link_elem = item.find("link") or item.find("{http://www.w3.org/2005/Atom}link")
-                    pub_date_elem = item.find("pubDate") or item.find("{http://www.w3.org/2005/Atom}published") or item.find("{http://www.w3.org/2005/Atom}updated")
-                    description_elem = item.find("description") or item.find("{http://www.w3.org/2005/Atom}summary") or item.find("{http://www.w3.org/2005/Atom}content")
-
-                    if title_elem is None:
-                        continue
-
-                    title = title_elem.text
-
-                    # Handle link differently for Atom feeds
-                    if link_elem is not None:
-                        link = link_elem.text if link_elem.text else link_elem.get("href")
-                    else:
+        for feed_name, feed_url, future in fetches:
+            try:
+                # The feed was parsed on the fetching thread as it streamed in
+                response, root = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"RSS feed {feed_name} unchanged")
+                    continue
+
+                # Detect RSS vs Atom once per feed and bind that format's readers
+                feed_format = _feed_format(root)
+                read_key = feed_format["key"]
+                read_date = feed_format["date"]
+                read_description = feed_format["description"]
+
+                for item in root.iter(feed_format["item"]):
+                    key = read_key(item)
+                    if key is None:
                         continue
+                    title, link = key
 
                     # Create unique ID
-                    item_id = f"rss_{feed_name}_{hash(link)}"
+                    item_id = make_item_id(f"rss_{feed_name}", link)
 
-                    if item_id in self.seen_items:
+                    # Skip seen items before any date or description work
+                    if item_id in seen or item_id in queued:
                         continue
 
                     # Parse publication date
-                    if pub_date_elem is not None:
-                        pub_date_str = pub_date_elem.text
-                        try:
-                            # Try RFC 2822 format first (RSS)
-                            from email.utils import parsedate_to_datetime
-                            try:
-                                pub_date = parsedate_to_datetime(pub_date_str)
-                            except:
-                                # Try ISO 8601 format (Atom)
-                                if "T" in pub_date_str:
-                                    # Remove timezone info for parsing
-                                    pub_date_str_clean = pub_date_str.replace("Z", "+00:00")
-                                    from datetime import datetime
-                                    pub_date = datetime.fromisoformat(pub_date_str_clean)
-                                else:
-                                    raise
-
-                            hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
-
-                            max_age_hours = rss_config.get("max_age_hours", 168)
-                            if hours_old > max_age_hours:
-                                self.seen_items.add(item_id)
-                                continue
-
-                            date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
-                        except Exception as e:
-                            self.logger.warning(f"Failed to parse date for {feed_name}: {e}")
+                    try:
+                        pub_date = read_date(item)
+                        if pub_date is None:
                             date_str = "Unknown"
-                    else:
+                        elif pub_date < cutoff:
+                            seen.add(item_id)
+                            continue
+                        else:
+                            date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
+                    except Exception as e:
+                        self.logger.warning(f"Failed to parse date for {feed_name}: {e}")
                         date_str = "Unknown"
 
                     # Categorize based on title and description
-                    description = description_elem.text if description_elem is not None else ""
-                    category = self._categorize_item(title, description)
+                    category = categorize(title, read_description(item))
 
                     content = (
                         f"**{feed_name}: {title}**\n"
@@ -235,38 +419,34 @@ class AINewsBot:
                         f"**URL:** {link}"
                     )
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(item_id)
-
-                    # Rate limiting
-                    time.sleep(2)
+                    queue(category, content, item_id)
 
-                # Delay between feeds
-                time.sleep(1)
+                remember_validators(self.validators, feed_url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking RSS feed {feed_name}: {e}")
 
-    def check_hackernews(self):
-        """Check Hacker News for stories matching keywords."""
+    def check_hackernews(self, fetches):
+        """Process fetched Hacker News searches for stories matching keywords."""
         if not self.config.get("sources", {}).get("hackernews", {}).get("enabled", False):
             return
 
         hn_config = self.config["sources"]["hackernews"]
-        keywords = hn_config.get("keywords", [])
+        max_age_hours = hn_config.get("max_age_hours", 48)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        try:
-            # Use Algolia HN Search API
-            base_url = "https://hn.algolia.com/api/v1/search"
-
-            for keyword in keywords:
-                params = {
-                    "query": keyword,
-                    "tags": "story",
-                    "hitsPerPage": 10,
-                }
+        # Bind per-item lookups once; the loops below run for every feed item
+        seen = self.seen_items
+        queued = self.post_queue
+        categorize = self._categorize_item
+        queue = self._queue_to_zulip
 
-                response = requests.get(base_url, params=params, timeout=10)
+        for keyword, search_url, future in fetches:
+            try:
+                response, _ = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"Hacker News results unchanged for '{keyword}'")
+                    continue
                 response.raise_for_status()
 
                 data = response.json()
@@ -274,22 +454,14 @@ class AINewsBot:
                 for hit in data.get("hits", []):
                     story_id = f"hn_story_{hit['objectID']}"
 
-                    if story_id in self.seen_items:
+                    if story_id in seen or story_id in queued:
                         continue
 
-                    # Check age - handle both date formats (with and without milliseconds)
-                    created_at_str = hit["created_at"]
-                    try:
-                        # Try with milliseconds first
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        # Fall back to format without milliseconds
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                    hours_old = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
-
-                    max_age_hours = hn_config.get("max_age_hours", 48)
-                    if hours_old > max_age_hours:
-                        self.seen_items.add(story_id)
+                    # Check age - created_at is ISO 8601 with or without milliseconds
+                    created_at = datetime.fromisoformat(hit["created_at"].replace("Z", "+00:00"))
+
+                    if created_at < cutoff:
+                        seen.add(story_id)
                         continue
 
                     # Format message
@@ -298,7 +470,7 @@ class AINewsBot:
                     points = hit.get("points", 0)
                     num_comments = hit.get("num_comments", 0)
 
-                    category = self._categorize_item(title)
+                    category = categorize(title)
 
                     content = (
                         f"**Hacker News: {title}**\n"
@@ -308,71 +480,67 @@ class AINewsBot:
                         f"**HN Discussion:** https://news.ycombinator.com/item?id={hit['objectID']}"
                     )
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(story_id)
-
-                    # Rate limiting
-                    time.sleep(2)
+                    queue(category, content, story_id)
 
-                # Delay between keyword searches
-                time.sleep(1)
+                remember_validators(self.validators, search_url, response.headers)
 
-        except Exception as e:
-            self.logger.error(f"Error checking Hacker News: {e}")
+            except Exception as e:
+                self.logger.error(f"Error checking Hacker News for '{keyword}': {e}")
 
-    def check_google_news(self):
-        """Check Google News RSS feed for configured search terms."""
+    def check_google_news(self, fetches):
+        """Process fetched Google News RSS results for configured search terms."""
         if not self.config.get("sources", {}).get("google_news", {}).get("enabled", False):
             return
 
         google_config = self.config["sources"]["google_news"]
-        keywords = google_config.get("keywords", [])
+        max_age_hours = google_config.get("max_age_hours", 168)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for keyword in keywords:
-            try:
-                # Google News RSS feed for search term
-                # URL encode the keyword for the query
-                import urllib.parse
-                encoded_keyword = urllib.parse.quote(keyword)
-                url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=en-US&gl=US&ceid=US:en"
+        # Bind per-item lookups once; the loops below run for every feed item
+        seen = self.seen_items
+        queued = self.post_queue
+        categorize = self._categorize_item
+        queue = self._queue_to_zulip
 
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-
-                # Parse RSS feed (simple XML parsing)
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
+        for keyword, search_url, future in fetches:
+            try:
+                # The feed was parsed on the fetching thread as it streamed in
+                response, root = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"Google News results unchanged for '{keyword}'")
+                    continue
 
                 # Google News RSS uses standard RSS 2.0 format
                 for item in root.findall(".//item"):
                     title_elem = item.find("title")
                     link_elem = item.find("link")
-                    pub_date_elem = item.find("pubDate")
 
                     if title_elem is None or link_elem is None:
                         continue
 
                     title = title_elem.text
-                    link = link_elem.text
+                    link = link_elem.text or link_elem.get("href")
+                    if not title or not link:
+                        continue
 
                     # Create unique ID
-                    news_id = f"google_news_{hash(link)}"
+                    news_id = make_item_id("google_news", link)
 
-                    if news_id in self.seen_items:
+                    # Skip seen items before any date work
+                    if news_id in seen or news_id in queued:
                         continue
 
+                    pub_date_elem = item.find("pubDate")
+
                     # Parse publication date
                     if pub_date_elem is not None:
                         pub_date_str = pub_date_elem.text
                         try:
                             # RFC 2822 format: "Wed, 02 Oct 2002 13:00:00 GMT"
-                            from email.utils import parsedate_to_datetime
                             pub_date = parsedate_to_datetime(pub_date_str)
-                            hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
 
-                            max_age_hours = google_config.get("max_age_hours", 168)
-                            if hours_old > max_age_hours:
-                                self.seen_items.add(news_id)
+                            if pub_date < cutoff:
+                                seen.add(news_id)
                                 continue
 
                             date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
@@ -383,7 +551,7 @@ class AINewsBot:
                         date_str = "Unknown"
 
                     # Categorize
-                    category = self._categorize_item(title)
+                    category = categorize(title)
 
                     content = (
                         f"**Google News: {title}**\n"
@@ -392,14 +560,9 @@ class AINewsBot:
                         f"**URL:** {link}"
                     )
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(news_id)
+                    queue(category, content, news_id)
 
-                    # Rate limiting
-                    time.sleep(2)
-
-                # Delay between keyword searches
-                time.sleep(1)
+                remember_validators(self.validators, search_url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking Google News for '{keyword}': {e}")
@@ -409,12 +572,26 @@ class AINewsBot:
         self.logger.info("Checking all sources for AI news...")
 
         try:
-            self.check_rss_feeds()
-            self.check_hackernews()
-            self.check_google_news()
-
-            # Save seen items after each check cycle
+            # Start every source's requests up front so the cycle's network
+            # time is roughly that of the slowest source, not the sum of all
+            rss_fetches = self._fetch_concurrently(self._rss_feed_urls(), parse_xml=True)
+            hn_fetches = self._fetch_concurrently(self._hackernews_urls())
+            google_fetches = self._fetch_concurrently(self._google_news_urls(), parse_xml=True)
+
+            self.check_rss_feeds(rss_fetches)
+            self.check_hackernews(hn_fetches)
+            self.check_google_news(google_fetches)
+
+            # Post everything found this cycle, batched per topic; items are
+            # only marked seen once posted, and failed posts stay queued
+            posted = self.post_queue.flush()
+
+            # Save seen items and HTTP validators after each check cycle. While
+            # posts are still queued, keep the validators saved before them so a
+            # restart refetches their sources instead of getting 304s
             self._save_seen_items()
+            if posted:
+                save_validators(self.validators_file, self.validators, self.logger)
 
         except Exception as e:
             self.logger.error(f"Error during source check: {e}")
@@ -430,10 +607,19 @@ class AINewsBot:
             if source_config.get("enabled", False):
                 self.logger.info(f"Monitoring source: {source_name}")
 
+        # Schedule cycles against a monotonic deadline so the time spent
+        # checking sources counts toward the interval instead of adding to it
+        deadline = time.monotonic()
         while True:
+            deadline += poll_interval
             self.check_all_sources()
-            self.logger.info(f"Sleeping for {poll_interval} seconds...")
-            time.sleep(poll_interval)
+
+            delay = max(0.0, deadline - time.monotonic())
+            if delay == 0.0:
+                # Cycle overran the interval; start the next one now
+                deadline = time.monotonic()
+            self.logger.info(f"Sleeping for {delay:.0f} seconds...")
+            time.sleep(delay)
 
 
 def main():
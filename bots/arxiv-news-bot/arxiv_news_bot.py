@@ -9,13 +9,18 @@ then posts updates to a Zulip channel.
 import sys
 import time
 import argparse
+import threading
+import urllib.error
 import urllib.request
 import urllib.parse
-import xml.etree.ElementTree as ET
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
 
+from lxml import etree
+
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.base_bot import BaseNewsBot
@@ -26,9 +31,16 @@ class ArxivNewsBot(BaseNewsBot):
 
     ARXIV_API_URL = "http://export.arxiv.org/api/query"
     ARXIV_RSS_URL = "http://export.arxiv.org/rss/{category}"
+    ATOM_NS = "http://www.w3.org/2005/Atom"
+
+    # arXiv asks clients to leave at least 3 seconds between requests
+    ARXIV_REQUEST_INTERVAL = 3.0
+    FETCH_WORKERS = 4
 
     def __init__(self, config_path: str):
         super().__init__(config_path, bot_name="arxiv_news_bot")
+        self._request_lock = threading.Lock()
+        self._next_request_at = 0.0
 
     def check_all_sources(self):
         """Check all configured arXiv sources."""
@@ -42,90 +54,139 @@ class ArxivNewsBot(BaseNewsBot):
         if sources.get("arxiv_rss", {}).get("enabled", False):
             self.check_arxiv_rss()
 
+    def _iter_elements(self, content: bytes, tag: str):
+        """Stream matching elements from an XML document, freeing each after use.
+
+        Only one entry's subtree is held in memory at a time. Parsing
+        recovers from malformed entries and never resolves external entities.
+        """
+        for _, elem in etree.iterparse(BytesIO(content), tag=tag, recover=True,
+                                       resolve_entities=False, huge_tree=False):
+            yield elem
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    def _fetch(self, url: str):
+        """Fetch a URL with a conditional GET.
+
+        Returns (content, headers), or (None, None) if the server reports the
+        resource unchanged since the last successful fetch.
+        """
+        request = urllib.request.Request(url, headers=self.conditional_headers(url))
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, None
+            raise
+
+    def _throttled_fetch(self, url: str):
+        """Fetch a URL, starting requests to arXiv no closer than ARXIV_REQUEST_INTERVAL apart.
+
+        Only the start of each request is serialized, so one slow response
+        doesn't hold up the next request once its slot comes around.
+        """
+        with self._request_lock:
+            delay = self._next_request_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_request_at = time.monotonic() + self.ARXIV_REQUEST_INTERVAL
+        return self._fetch(url)
+
     def check_arxiv_api(self):
         """Search arXiv API for papers matching queries."""
         api_config = self.config["sources"]["arxiv_api"]
         queries = api_config.get("queries", [])
         max_results = api_config.get("max_results", 50)
         max_age_hours = api_config.get("max_age_hours", 168)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
+        # Build API query URLs
+        urls = {}
         for query in queries:
-            try:
-                # Build API query
-                params = {
-                    "search_query": f"all:{query}",
-                    "start": 0,
-                    "max_results": max_results,
-                    "sortBy": "submittedDate",
-                    "sortOrder": "descending"
-                }
-                url = f"{self.ARXIV_API_URL}?{urllib.parse.urlencode(params)}"
-
-                self.logger.debug(f"Querying arXiv API: {query}")
-
-                # Make request
-                with urllib.request.urlopen(url, timeout=30) as response:
-                    content = response.read()
+            params = {
+                "search_query": f"all:{query}",
+                "start": 0,
+                "max_results": max_results,
+                "sortBy": "submittedDate",
+                "sortOrder": "descending"
+            }
+            urls[query] = f"{self.ARXIV_API_URL}?{urllib.parse.urlencode(params)}"
+
+        # Fetch on worker threads (still rate limited) and parse each result
+        # on this thread while the next request is in flight
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            futures = {executor.submit(self._throttled_fetch, url): query for query, url in urls.items()}
+
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    content, headers = future.result()
+                    if content is None:
+                        self.logger.debug(f"arXiv API results unchanged for '{query}'")
+                        continue
 
-                # Parse Atom feed
-                root = ET.fromstring(content)
-                ns = {"atom": "http://www.w3.org/2005/Atom"}
+                    # Stream entries from the Atom feed
+                    ns = {"atom": self.ATOM_NS}
 
-                for entry in root.findall("atom:entry", ns):
-                    self._process_arxiv_entry(entry, ns, max_age_hours, f"search:{query}")
+                    for entry in self._iter_elements(content, f"{{{self.ATOM_NS}}}entry"):
+                        self._process_arxiv_entry(entry, ns, cutoff, f"search:{query}")
 
-                # Rate limiting between queries
-                time.sleep(3)
+                    self.remember_validators(urls[query], headers)
 
-            except Exception as e:
-                self.logger.error(f"Error querying arXiv API for '{query}': {e}")
+                except Exception as e:
+                    self.logger.error(f"Error querying arXiv API for '{query}': {e}")
 
     def check_arxiv_rss(self):
         """Check arXiv RSS feeds for new papers in configured categories."""
         rss_config = self.config["sources"]["arxiv_rss"]
         categories = rss_config.get("categories", [])
         max_age_hours = rss_config.get("max_age_hours", 72)
-        filter_keywords = rss_config.get("filter_keywords", [])
+        filter_keywords = [keyword.lower() for keyword in rss_config.get("filter_keywords", [])]
 
         for category in categories:
             try:
                 url = self.ARXIV_RSS_URL.format(category=category)
                 self.logger.debug(f"Checking arXiv RSS: {category}")
 
-                with urllib.request.urlopen(url, timeout=30) as response:
-                    content = response.read()
+                content, headers = self._throttled_fetch(url)
+                if content is None:
+                    self.logger.debug(f"arXiv RSS unchanged for {category}")
+                    continue
 
-                # Parse RSS feed
-                root = ET.fromstring(content)
-
-                for item in root.findall(".//item"):
+                # Stream items from the RSS feed
+                for item in self._iter_elements(content, "item"):
                     title = item.find("title")
                     link = item.find("link")
-                    description = item.find("description")
 
                     if title is None or link is None:
                         continue
 
                     title_text = title.text or ""
                     link_text = link.text or ""
-                    desc_text = description.text if description is not None else ""
 
-                    # Filter by keywords
-                    combined_text = f"{title_text} {desc_text}"
-                    if filter_keywords and not self._matches_keywords(combined_text, filter_keywords):
+                    # Create unique ID from link and skip seen papers before
+                    # reading the description or running the keyword filter
+                    paper_id = self.make_item_id("arxiv_rss", link_text)
+
+                    if self.is_seen(paper_id):
                         continue
 
-                    # Create unique ID from link
-                    paper_id = f"arxiv_rss_{hash(link_text)}"
+                    description = item.find("description")
+                    desc_text = description.text if description is not None else ""
 
-                    if self.is_seen(paper_id):
+                    # Lowercase once for both the keyword filter and categorizing
+                    combined_lower = f"{title_text} {desc_text}".lower()
+                    if filter_keywords and not any(keyword in combined_lower for keyword in filter_keywords):
                         continue
 
                     # Extract arxiv ID from link
                     arxiv_id = link_text.split("/")[-1] if link_text else "unknown"
 
                     # Categorize
-                    category_name = self._categorize_item(title_text, desc_text)
+                    category_name = self._categorize_lowered(combined_lower)
 
                     # Format message
                     content = (
@@ -142,34 +203,25 @@ class ArxivNewsBot(BaseNewsBot):
                             clean_desc = clean_desc[:500] + "..."
                         content += f"\n**Abstract:**\n{clean_desc}"
 
-                    self._post_to_zulip(category_name, content)
-                    self.mark_seen(paper_id)
-
-                    time.sleep(2)
+                    self._queue_to_zulip(category_name, content, paper_id)
 
-                # Rate limiting between categories
-                time.sleep(3)
+                self.remember_validators(url, headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking arXiv RSS for {category}: {e}")
 
-    def _process_arxiv_entry(self, entry, ns: dict, max_age_hours: int, source: str):
+    def _process_arxiv_entry(self, entry, ns: dict, cutoff: datetime, source: str):
         """Process a single arXiv API entry."""
         try:
-            # Extract fields
+            # Extract the ID first so seen papers are skipped cheaply
             id_elem = entry.find("atom:id", ns)
             title_elem = entry.find("atom:title", ns)
-            summary_elem = entry.find("atom:summary", ns)
-            published_elem = entry.find("atom:published", ns)
-            updated_elem = entry.find("atom:updated", ns)
 
             if id_elem is None or title_elem is None:
                 return
 
             arxiv_url = id_elem.text
             arxiv_id = arxiv_url.split("/")[-1] if arxiv_url else "unknown"
-            title = title_elem.text.replace("\n", " ").strip() if title_elem.text else ""
-            summary = summary_elem.text.replace("\n", " ").strip() if summary_elem is not None and summary_elem.text else ""
 
             # Create unique ID
             paper_id = f"arxiv_api_{arxiv_id}"
@@ -177,13 +229,20 @@ class ArxivNewsBot(BaseNewsBot):
             if self.is_seen(paper_id):
                 return
 
+            # Extract remaining fields
+            summary_elem = entry.find("atom:summary", ns)
+            published_elem = entry.find("atom:published", ns)
+            updated_elem = entry.find("atom:updated", ns)
+            title = title_elem.text.replace("\n", " ").strip() if title_elem.text else ""
+            summary = summary_elem.text.replace("\n", " ").strip() if summary_elem is not None and summary_elem.text else ""
+
             # Check age
             date_str = published_elem.text if published_elem is not None else (updated_elem.text if updated_elem is not None else None)
             if date_str:
                 try:
                     # arXiv uses ISO format
                     pub_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                    if self.is_too_old(pub_date, max_age_hours):
+                    if pub_date < cutoff:
                         self.mark_seen(paper_id)
                         return
                     date_display = pub_date.strftime('%Y-%m-%d')
@@ -229,8 +288,7 @@ class ArxivNewsBot(BaseNewsBot):
                     truncated += "..."
                 content += f"\n**Abstract:**\n{truncated}"
 
-            self._post_to_zulip(category, content)
-            self.mark_seen(paper_id)
+            self._queue_to_zulip(category, content, paper_id)
 
         except Exception as e:
             self.logger.error(f"Error processing arXiv entry: {e}")
@@ -7,17 +7,19 @@ then posts updates to a Zulip channel.
 """
 
 import sys
-import time
 import argparse
-import urllib.request
 import urllib.parse
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.base_bot import BaseNewsBot
+from shared.rate_limit import TokenBucket
 
 
 class BlueskyNewsBot(BaseNewsBot):
@@ -27,11 +29,39 @@ class BlueskyNewsBot(BaseNewsBot):
     PUBLIC_API_URL = "https://public.api.bsky.app"
     BSKY_API_URL = "https://bsky.social"
 
+    # Maximum number of search requests in flight at once
+    FETCH_WORKERS = 4
+    # Sustained search request rate (one every 2 seconds)
+    SEARCH_REQUESTS_PER_SECOND = 0.5
+
     def __init__(self, config_path: str):
         super().__init__(config_path, bot_name="bluesky_news_bot")
+        self.http = self._create_http_session()
+        self.search_limit = TokenBucket(rate=self.SEARCH_REQUESTS_PER_SECOND, capacity=1)
         self.access_token = None
+        self.search_headers = self._build_search_headers()
         self._authenticate()
 
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session so searches reuse connections to the API host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.FETCH_WORKERS)
+        session.mount("https://", adapter)
+        return session
+
+    def _build_search_headers(self) -> dict:
+        """Build the headers sent with every search, including auth if we have a token."""
+        headers = {
+            "Accept": "application/json",
+            "User-Agent": "BlueskyNewsBot/1.0 (Zulip integration)",
+        }
+
+        # Add auth header if authenticated
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+
+        return headers
+
     def _authenticate(self):
         """Authenticate with Bluesky using app password if credentials provided."""
         bluesky_config = self.config.get("sources", {}).get("bluesky_search", {})
@@ -44,19 +74,21 @@ class BlueskyNewsBot(BaseNewsBot):
 
         try:
             url = f"{self.BSKY_API_URL}/xrpc/com.atproto.server.createSession"
-            data = json.dumps({
-                "identifier": identifier,
-                "password": app_password
-            }).encode("utf-8")
-
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "application/json")
-            req.add_header("User-Agent", "BlueskyNewsBot/1.0")
+            response = self.http.post(
+                url,
+                json={
+                    "identifier": identifier,
+                    "password": app_password
+                },
+                headers={"User-Agent": "BlueskyNewsBot/1.0"},
+                timeout=30,
+            )
+            response.raise_for_status()
 
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode())
-                self.access_token = result.get("accessJwt")
-                self.logger.info(f"Authenticated with Bluesky as {identifier}")
+            result = response.json()
+            self.access_token = result.get("accessJwt")
+            self.search_headers = self._build_search_headers()
+            self.logger.info(f"Authenticated with Bluesky as {identifier}")
 
         except Exception as e:
             self.logger.warning(f"Failed to authenticate with Bluesky: {e}")
@@ -84,47 +116,64 @@ class BlueskyNewsBot(BaseNewsBot):
         else:
             base_url = f"{self.PUBLIC_API_URL}/xrpc/app.bsky.feed.searchPosts"
 
+        # Build API query URLs
+        urls = {}
         for query in queries:
-            try:
-                # Build API query
-                params = {
-                    "q": query,
-                    "limit": max_results,
-                    "sort": "latest"
-                }
-                url = f"{base_url}?{urllib.parse.urlencode(params)}"
-
-                self.logger.debug(f"Querying Bluesky: {query}")
-
-                # Make request
-                req = urllib.request.Request(url)
-                req.add_header("Accept", "application/json")
-                req.add_header("User-Agent", "BlueskyNewsBot/1.0 (Zulip integration)")
-
-                # Add auth header if authenticated
-                if self.access_token:
-                    req.add_header("Authorization", f"Bearer {self.access_token}")
-
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    data = json.loads(response.read().decode())
-
-                posts = data.get("posts", [])
-                self.logger.info(f"Found {len(posts)} posts for query: {query}")
-
-                for post in posts:
-                    self._process_post(post, max_age_hours, query)
-
-                # Rate limiting between queries
-                time.sleep(2)
-
-            except urllib.error.HTTPError as e:
-                self.logger.error(f"HTTP error querying Bluesky for '{query}': {e.code} {e.reason}")
-                # If auth failed, try to re-authenticate
-                if e.code == 401 and self.access_token:
-                    self.logger.info("Token expired, re-authenticating...")
-                    self._authenticate()
-            except Exception as e:
-                self.logger.error(f"Error querying Bluesky for '{query}': {e}")
+            params = {
+                "q": query,
+                "limit": max_results,
+                "sort": "latest"
+            }
+            urls[query] = f"{base_url}?{urllib.parse.urlencode(params)}"
+
+        # Run the searches concurrently and process each result on this
+        # thread as it arrives, so seen items and posting stay single-threaded
+        reauthenticated = False
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            futures = {executor.submit(self._search, url): query for query, url in urls.items()}
+
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    response, data = future.result()
+                    if data is None:
+                        self.logger.debug(f"Bluesky results unchanged for query: {query}")
+                        continue
+
+                    posts = data.get("posts", [])
+                    self.logger.info(f"Found {len(posts)} posts for query: {query}")
+
+                    for post in posts:
+                        self._process_post(post, max_age_hours, query)
+
+                    self.remember_validators(urls[query], response.headers)
+
+                except requests.HTTPError as e:
+                    status = e.response.status_code
+                    self.logger.error(f"HTTP error querying Bluesky for '{query}': {status} {e.response.reason}")
+                    # If auth failed, try to re-authenticate (once per cycle,
+                    # however many in-flight searches were rejected)
+                    if status == 401 and self.access_token and not reauthenticated:
+                        self.logger.info("Token expired, re-authenticating...")
+                        self._authenticate()
+                        reauthenticated = True
+                except Exception as e:
+                    self.logger.error(f"Error querying Bluesky for '{query}': {e}")
+
+    def _search(self, url: str):
+        """Run one conditional Bluesky search request, returning (response, data).
+
+        data is the decoded JSON, or None if the results are unchanged (304).
+        """
+        self.logger.debug(f"Querying Bluesky: {url}")
+
+        headers = {**self.search_headers, **self.conditional_headers(url)}
+        self.search_limit.acquire()
+        response = self.http.get(url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return response, None
+        response.raise_for_status()
+        return response, response.json()
 
     def _process_post(self, post: dict, max_age_hours: int, query: str):
         """Process a single Bluesky post."""
@@ -137,7 +186,7 @@ class BlueskyNewsBot(BaseNewsBot):
             indexed_at = post.get("indexedAt", "")
 
             # Create unique ID
-            post_id = f"bluesky_{cid}" if cid else f"bluesky_{hash(uri)}"
+            post_id = f"bluesky_{cid}" if cid else self.make_item_id("bluesky", uri)
 
             if self.is_seen(post_id):
                 return
@@ -195,8 +244,7 @@ class BlueskyNewsBot(BaseNewsBot):
                 text = text[:500] + "..."
             content += f"\n{text}"
 
-            self._post_to_zulip(category, content)
-            self.mark_seen(post_id)
+            self._queue_to_zulip(category, content, post_id)
 
         except Exception as e:
             self.logger.error(f"Error processing Bluesky post: {e}")
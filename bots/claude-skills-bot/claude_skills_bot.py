@@ -10,34 +10,163 @@ Context: Tracking potential AGPL attribution issues related to "Dollhouse Skills
 """
 
 import os
+import re
 import sys
-import time
 import json
+import signal
 import logging
 import argparse
+import threading
+import urllib.parse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Set, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Tuple
 
 import yaml
 import zulip
 from dotenv import load_dotenv
+from lxml import etree
+
+# Add parent directory to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.common import (
+    PostQueue,
+    conditional_headers,
+    load_validators,
+    make_item_id,
+    remember_validators,
+    save_validators,
+    state_dir,
+)
+from shared.rate_limit import TokenBucket
+from shared.seen_filter import BloomFilter
 
 # Load .env file from script directory
 load_dotenv(Path(__file__).parent / ".env")
 
+# Maximum number of search requests in flight at once
+FETCH_WORKERS = 8
+
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search"
+
+# Requests per second allowed to hosts that throttle unauthenticated clients
+HOST_REQUESTS_PER_SECOND = {
+    "news.google.com": 1.0,
+}
+
+
+def _compile_terms(terms: Tuple[str, ...]) -> "re.Pattern":
+    """Compile substring terms into one alternation, longest first, so text is scanned once per list."""
+    return re.compile("|".join(map(re.escape, sorted(terms, key=len, reverse=True))))
+
+
+# Relevance filter terms, matched as substrings of lowercased title/body text
+
+# Mentions of Anthropic or Claude as a product, not as a name
+ANTHROPIC_TERMS = (
+    "anthropic",
+    "claude's",  # possessive implies the product
+    "claude ai",
+    "claude 3",
+    "claude 4",
+    "claude opus",
+    "claude sonnet",
+    "claude haiku",
+)
+
+# AI-related terms that make a bare "claude" mention count as the product
+CLAUDE_AI_CONTEXT_TERMS = (
+    "ai", "agent", "skill", "workflow", "llm", "model", "chatbot", "assistant"
+)
+
+# Skills in an AI context - be more permissive
+SKILLS_TERMS = (
+    "agent skills",
+    "claude skills",
+    "custom skills",
+    "ai skills",
+    "skill system",
+    "skills feature",
+    "skills api",
+    "skills framework",
+    "skills for claude",
+    "skills to claude",
+    " skills",  # space before to catch "new skills", "mad skills", etc.
+)
+
+# Generic job/career/learning content
+JOB_TERMS = (
+    "job opening",
+    "job posting",
+    "career",
+    "hiring",
+    "resume",
+    "cv ",
+    "employment",
+    "learn skills",
+    "skill development",
+    "professional skills",
+    "soft skills",
+    "hard skills",
+    "technical skills interview",
+    "job skills",
+)
+
+# Overly generic titles
+GENERIC_TITLE_TERMS = (
+    "10 skills",
+    "5 skills",
+    "essential skills",
+    "must-have skills",
+    "skills you need",
+    "skills to learn",
+    "top skills",
+    "best skills",
+)
+
+# Each term list compiled once into a single pattern
+ANTHROPIC_PATTERN = _compile_terms(ANTHROPIC_TERMS)
+CLAUDE_AI_CONTEXT_PATTERN = _compile_terms(CLAUDE_AI_CONTEXT_TERMS)
+SKILLS_PATTERN = _compile_terms(SKILLS_TERMS)
+JOB_PATTERN = _compile_terms(JOB_TERMS)
+GENERIC_TITLE_PATTERN = _compile_terms(GENERIC_TITLE_TERMS)
+
 
 class ClaudeSkillsBot:
     """Bot that monitors web sources for Anthropic Agent Skills news and posts to Zulip."""
 
     def __init__(self, config_path: str):
         self.script_dir = Path(__file__).parent
+        self.state_dir = state_dir(self.script_dir)
         self.config = self._load_config(config_path)
         self._setup_logging()
         self.logger = logging.getLogger("claude_skills_bot")
         self.zulip_client = self._create_zulip_client()
+        self.zulip_rate_limit = TokenBucket.per_minute(
+            self.config.get("zulip", {}).get("posts_per_minute", 180)
+        )
+        self.http = self._create_http_session()
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        self.host_rate_limits = {
+            host: TokenBucket(rate=rate, capacity=1)
+            for host, rate in HOST_REQUESTS_PER_SECOND.items()
+        }
         self.seen_items = self._load_seen_items()
+        self._saved_count = len(self.seen_items)
+        self.validators_file = self.state_dir / "http_cache.json"
+        self.validators = load_validators(self.validators_file, self.logger)
+        self.post_queue = PostQueue(self._send_to_zulip, self.seen_items.add, self.logger)
+        self._stop_event = threading.Event()
+
+        # Search URLs depend only on the config, so build them once
+        self.google_news_urls = self._build_google_news_urls()
+        self.hackernews_urls = self._build_hackernews_urls()
+        self.anthropic_site_urls = self._build_anthropic_site_urls()
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
@@ -83,29 +212,56 @@ class ClaudeSkillsBot:
         self.logger.info(f"Created Zulip client for {zulip_config['site']}")
         return client
 
-    def _load_seen_items(self) -> Set[str]:
-        """Load set of already-seen item IDs from disk."""
-        seen_file = self.script_dir / "seen_items.json"
-        if seen_file.exists():
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session so repeated hosts reuse connections.
+
+        Transient failures (rate limiting, gateway errors) are retried with
+        backoff before a search is reported as failed.
+        """
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _load_seen_items(self) -> BloomFilter:
+        """Map the filter of already-seen item IDs from disk."""
+        bloom_file = self.state_dir / "seen_items.bloom"
+        try:
+            seen = BloomFilter.open(bloom_file)
+            self.logger.info(f"Loaded {len(seen)} seen items from disk")
+        except Exception as e:
+            self.logger.warning(f"Failed to load seen items, starting a new filter: {e}")
+            seen = BloomFilter.create(bloom_file)
+
+        # Migrate IDs from the old JSON list format into a new filter. The file
+        # is read from the state directory, so under Docker Compose it has to
+        # be copied into state/ once; without BOT_STATE_DIR that is the bot's
+        # own directory, where it always lived
+        legacy_file = self.state_dir / "seen_items.json"
+        if len(seen) == 0 and legacy_file.is_file():
             try:
-                with open(seen_file, "r") as f:
-                    data = json.load(f)
-                    seen = set(data.get("items", []))
-                    self.logger.info(f"Loaded {len(seen)} seen items from disk")
-                    return seen
+                with open(legacy_file, "r") as f:
+                    for item_id in json.load(f).get("items", []):
+                        seen.add(item_id)
+                seen.flush()
+                self.logger.info(f"Migrated {len(seen)} seen items from {legacy_file.name}")
             except Exception as e:
-                self.logger.warning(f"Failed to load seen items: {e}")
-        return set()
+                self.logger.warning(f"Failed to migrate seen items: {e}")
+
+        return seen
 
     def _save_seen_items(self):
-        """Save seen item IDs to disk."""
-        seen_file = self.script_dir / "seen_items.json"
+        """Write the seen-items filter's changed pages back to disk."""
+        # The count drops when the filter rotates, so compare rather than subtract
+        count = len(self.seen_items)
+        if count == self._saved_count:
+            return
         try:
-            # Keep only the most recent 2000 items to prevent unbounded growth
-            items_to_save = list(self.seen_items)[-2000:]
-            with open(seen_file, "w") as f:
-                json.dump({"items": items_to_save, "last_updated": datetime.now(timezone.utc).isoformat()}, f, indent=2)
-            self.logger.debug(f"Saved {len(items_to_save)} seen items to disk")
+            self.seen_items.flush()
+            self._saved_count = count
+            self.logger.debug(f"Saved seen items to disk ({count} remembered)")
         except Exception as e:
             self.logger.error(f"Failed to save seen items: {e}")
 
@@ -120,98 +276,54 @@ class ClaudeSkillsBot:
         - Resumes/careers
         - Generic AI assistant capabilities without specific "skills" feature mention
         """
-        combined = f"{title} {body}".lower()
+        # Cheap title-only exclusions first - most off-topic feed items are
+        # rejected here before the body is lowercased or scanned
+        title_lower = title.lower()
+        if GENERIC_TITLE_PATTERN.search(title_lower):
+            self.logger.debug(f"Filtered out - generic skills article: {title}")
+            return False
+
+        if JOB_PATTERN.search(title_lower):
+            self.logger.debug(f"Filtered out - job/career related: {title}")
+            return False
+
+        combined = f"{title_lower} {body.lower()}"
 
         # Must mention Anthropic or Claude (as a product, not as a name)
-        has_anthropic = any(term in combined for term in [
-            "anthropic",
-            "claude's",  # possessive implies the product
-            "claude ai",
-            "claude 3",
-            "claude 4",
-            "claude opus",
-            "claude sonnet",
-            "claude haiku",
-        ])
+        has_anthropic = ANTHROPIC_PATTERN.search(combined) is not None
 
         # Also check if "claude" appears near AI-related terms
         if not has_anthropic and "claude" in combined:
-            ai_context = any(term in combined for term in [
-                "ai", "agent", "skill", "workflow", "llm", "model", "chatbot", "assistant"
-            ])
-            if ai_context:
+            if CLAUDE_AI_CONTEXT_PATTERN.search(combined):
                 has_anthropic = True
 
         if not has_anthropic:
             self.logger.debug(f"Filtered out - no Anthropic/Claude mention: {title}")
             return False
 
-        # Must mention skills in AI context - be more permissive
-        has_skills_mention = any(term in combined for term in [
-            "agent skills",
-            "claude skills",
-            "custom skills",
-            "ai skills",
-            "skill system",
-            "skills feature",
-            "skills api",
-            "skills framework",
-            "skills for claude",
-            "skills to claude",
-            " skills",  # space before to catch "new skills", "mad skills", etc.
-        ])
-
-        if not has_skills_mention:
+        # Must mention skills in AI context
+        if not SKILLS_PATTERN.search(combined):
             self.logger.debug(f"Filtered out - no relevant skills mention: {title}")
             return False
 
-        # Exclude generic job/career/learning content
-        job_related = any(term in combined for term in [
-            "job opening",
-            "job posting",
-            "career",
-            "hiring",
-            "resume",
-            "cv ",
-            "employment",
-            "learn skills",
-            "skill development",
-            "professional skills",
-            "soft skills",
-            "hard skills",
-            "technical skills interview",
-            "job skills",
-        ])
-
-        if job_related:
+        # Exclude generic job/career/learning content in the body as well
+        if JOB_PATTERN.search(combined):
             self.logger.debug(f"Filtered out - job/career related: {title}")
             return False
 
-        # Additional quality filters - exclude if title is too generic
-        generic_patterns = [
-            "10 skills",
-            "5 skills",
-            "essential skills",
-            "must-have skills",
-            "skills you need",
-            "skills to learn",
-            "top skills",
-            "best skills",
-        ]
-
-        title_lower = title.lower()
-        if any(pattern in title_lower for pattern in generic_patterns):
-            self.logger.debug(f"Filtered out - generic skills article: {title}")
-            return False
-
         return True
 
-    def _post_to_zulip(self, content: str):
-        """Post news item to Zulip."""
+    def _queue_to_zulip(self, content: str, item_id: str):
+        """Queue a news item for the configured Zulip stream/topic, marking it seen once posted."""
         zulip_config = self.config.get("zulip", {})
         stream = zulip_config.get("stream", "claude-skills-watch")
         topic = zulip_config.get("topic", "News & Updates")
 
+        self.post_queue.add(stream, topic, content, item_id)
+
+    def _send_to_zulip(self, stream: str, topic: str, content: str) -> bool:
+        """Send a single message to a Zulip stream/topic, returning whether it was posted."""
+        self.zulip_rate_limit.acquire()
         result = self.zulip_client.send_message({
             "type": "stream",
             "to": stream,
@@ -221,50 +333,148 @@ class ClaudeSkillsBot:
 
         if result.get("result") != "success":
             self.logger.error(f"Failed to send to Zulip: {result}")
-        else:
-            self.logger.info(f"Posted to #{stream} > {topic}")
+            return False
+        self.logger.info(f"Posted to #{stream} > {topic}")
+        return True
 
-    def check_google_news(self):
-        """Check Google News RSS feed for configured search terms."""
-        if not self.config.get("sources", {}).get("google_news", {}).get("enabled", False):
-            return
+    def _fetch_concurrently(self, urls: Dict[str, str], fetch):
+        """Start fetching all URLs now and return an iterator of (key, url, future).
 
-        google_config = self.config["sources"]["google_news"]
-        search_queries = google_config.get("search_queries", [])
+        Each URL is passed to fetch (_fetch_feed_items or _fetch_json) on a
+        worker thread. Requests are submitted immediately, so fetches for
+        several sources can be started before any of them is consumed. The
+        iterator yields in completion order; callers call future.result()
+        inside their own error handling so a failed fetch is reported against
+        the query it belongs to.
+        """
+        futures = {
+            self.executor.submit(fetch, url): (key, url)
+            for key, url in urls.items()
+        }
+        return ((*futures[future], future) for future in as_completed(futures))
 
-        for query in search_queries:
-            try:
-                # Google News RSS feed for search term
-                import urllib.parse
-                encoded_query = urllib.parse.quote(query)
-                url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+    def _wait_for_host(self, url: str):
+        """Wait out the URL's host rate limit, if it has one.
 
-                self.logger.info(f"Checking Google News for: {query}")
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
+        The token bucket only blocks once the host's allowance is used up,
+        so there is no fixed delay between requests.
+        """
+        rate_limit = self.host_rate_limits.get(urllib.parse.urlsplit(url).hostname or "")
+        if rate_limit is not None:
+            rate_limit.acquire()
 
-                # Parse RSS feed
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
+    def _fetch_json(self, url: str):
+        """Conditionally GET a URL, returning (response, data).
 
-                # Google News RSS uses standard RSS 2.0 format
-                for item in root.findall(".//item"):
-                    title_elem = item.find("title")
-                    link_elem = item.find("link")
-                    pub_date_elem = item.find("pubDate")
-                    description_elem = item.find("description")
+        data is the decoded JSON body, or None for a 304 response.
+        """
+        self._wait_for_host(url)
+        response = self.http.get(url, headers=conditional_headers(self.validators, url), timeout=10)
+        if response.status_code == 304:
+            return response, None
+        response.raise_for_status()
+        return response, response.json()
+
+    def _fetch_feed_items(self, url: str):
+        """Conditionally GET an RSS feed, returning (response, items).
+
+        items is a list of (title, link, pubDate, description) tuples, or
+        None for a 304 response. The body is parsed as it streams off the
+        connection rather than first being buffered as response.content,
+        and only the text fields of each item are kept.
+        """
+        self._wait_for_host(url)
+        with self.http.get(url, headers=conditional_headers(self.validators, url), timeout=10, stream=True) as response:
+            if response.status_code == 304:
+                return response, None
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            items = []
+            for item in self._iter_items(response.raw):
+                # One pass over the item's children instead of a find() per field
+                fields = {child.tag: child.text for child in item}
+                title = fields.get("title")
+                link = fields.get("link")
+                if title is None or link is None:
+                    continue
+                items.append((title, link, fields.get("pubDate"), fields.get("description") or ""))
+            return response, items
 
-                    if title_elem is None or link_elem is None:
-                        continue
+    def _iter_items(self, source):
+        """Stream RSS <item> elements from a feed file object, freeing each after use.
 
-                    title = title_elem.text
-                    link = link_elem.text
-                    description = description_elem.text if description_elem is not None else ""
+        Only one item's subtree is held in memory at a time. Parsing
+        recovers from malformed items and never resolves external entities.
+        """
+        for _, elem in etree.iterparse(source, tag="item", recover=True,
+                                       resolve_entities=False, huge_tree=False):
+            yield elem
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    def _google_news_url(self, query: str) -> str:
+        """Build the Google News RSS search URL for a query."""
+        encoded_query = urllib.parse.quote(query)
+        return f"{GOOGLE_NEWS_RSS_URL}?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+
+    def _build_google_news_urls(self) -> Dict[str, str]:
+        """Return {query: Google News RSS URL} for the Google News source, if enabled."""
+        google_config = self.config.get("sources", {}).get("google_news", {})
+        if not google_config.get("enabled", False):
+            return {}
+        return {query: self._google_news_url(query) for query in google_config.get("search_queries", [])}
+
+    def _build_hackernews_urls(self) -> Dict[str, str]:
+        """Return {keyword: Algolia search URL} for the Hacker News source, if enabled."""
+        hn_config = self.config.get("sources", {}).get("hackernews", {})
+        if not hn_config.get("enabled", False):
+            return {}
+
+        # Use Algolia HN Search API
+        base_url = "https://hn.algolia.com/api/v1/search"
+        urls = {}
+        for keyword in hn_config.get("keywords", []):
+            params = {
+                "query": keyword,
+                "tags": "story",
+                "hitsPerPage": 20,  # Get more hits since we're filtering heavily
+            }
+            urls[keyword] = f"{base_url}?{urllib.parse.urlencode(params)}"
+        return urls
+
+    def _build_anthropic_site_urls(self) -> Dict[str, str]:
+        """Return {query: Google News RSS URL} for the Anthropic site search, if enabled."""
+        if not self.config.get("sources", {}).get("anthropic_site", {}).get("enabled", False):
+            return {}
+
+        # Use Google News RSS with site: operator
+        query = "site:anthropic.com skills"
+        return {query: self._google_news_url(query)}
+
+    def check_google_news(self, fetches):
+        """Process fetched Google News RSS results for configured search terms."""
+        if not self.config.get("sources", {}).get("google_news", {}).get("enabled", False):
+            return
 
+        google_config = self.config["sources"]["google_news"]
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=google_config.get("max_age_hours", 168))
+
+        for query, url, future in fetches:
+            try:
+                self.logger.info(f"Checking Google News for: {query}")
+                response, items = future.result()
+                if items is None:
+                    self.logger.debug(f"Google News results unchanged for: {query}")
+                    continue
+
+                # Items were parsed on the fetching thread as the feed streamed in
+                for title, link, pub_date_str, description in items:
                     # Create unique ID
-                    news_id = f"google_news_{hash(link)}"
+                    news_id = make_item_id("google_news", link)
 
-                    if news_id in self.seen_items:
+                    if news_id in self.seen_items or news_id in self.post_queue:
                         continue
 
                     # STRICT FILTERING - must pass relevance check
@@ -273,15 +483,10 @@ class ClaudeSkillsBot:
                         continue
 
                     # Parse publication date
-                    if pub_date_elem is not None:
-                        pub_date_str = pub_date_elem.text
+                    if pub_date_str:
                         try:
-                            from email.utils import parsedate_to_datetime
                             pub_date = parsedate_to_datetime(pub_date_str)
-                            hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
-
-                            max_age_hours = google_config.get("max_age_hours", 168)
-                            if hours_old > max_age_hours:
+                            if pub_date < cutoff:
                                 self.seen_items.add(news_id)
                                 continue
 
@@ -302,47 +507,33 @@ class ClaudeSkillsBot:
                     )
 
                     self.logger.info(f"POSTING: {title}")
-                    self._post_to_zulip(content)
-                    self.seen_items.add(news_id)
-
-                    # Rate limiting
-                    time.sleep(2)
+                    self._queue_to_zulip(content, news_id)
 
-                # Delay between searches
-                time.sleep(1)
+                remember_validators(self.validators, url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking Google News for '{query}': {e}")
 
-    def check_hackernews(self):
-        """Check Hacker News for stories matching keywords."""
+    def check_hackernews(self, fetches):
+        """Process fetched Hacker News searches for stories matching keywords."""
         if not self.config.get("sources", {}).get("hackernews", {}).get("enabled", False):
             return
 
         hn_config = self.config["sources"]["hackernews"]
-        keywords = hn_config.get("keywords", [])
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hn_config.get("max_age_hours", 168))
 
-        try:
-            # Use Algolia HN Search API
-            base_url = "https://hn.algolia.com/api/v1/search"
-
-            for keyword in keywords:
+        for keyword, search_url, future in fetches:
+            try:
                 self.logger.info(f"Checking Hacker News for: {keyword}")
-                params = {
-                    "query": keyword,
-                    "tags": "story",
-                    "hitsPerPage": 20,  # Get more hits since we're filtering heavily
-                }
-
-                response = requests.get(base_url, params=params, timeout=10)
-                response.raise_for_status()
-
-                data = response.json()
+                response, data = future.result()
+                if data is None:
+                    self.logger.debug(f"Hacker News results unchanged for '{keyword}'")
+                    continue
 
                 for hit in data.get("hits", []):
                     story_id = f"hn_story_{hit['objectID']}"
 
-                    if story_id in self.seen_items:
+                    if story_id in self.seen_items or story_id in self.post_queue:
                         continue
 
                     title = hit.get("title", "")
@@ -353,16 +544,9 @@ class ClaudeSkillsBot:
                         self.seen_items.add(story_id)
                         continue
 
-                    # Check age
-                    created_at_str = hit["created_at"]
-                    try:
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                    hours_old = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
-
-                    max_age_hours = hn_config.get("max_age_hours", 168)
-                    if hours_old > max_age_hours:
+                    # Check age - created_at is ISO 8601 with or without milliseconds
+                    created_at = datetime.fromisoformat(hit["created_at"].replace("Z", "+00:00"))
+                    if created_at < cutoff:
                         self.seen_items.add(story_id)
                         continue
 
@@ -382,112 +566,97 @@ class ClaudeSkillsBot:
                     )
 
                     self.logger.info(f"POSTING: {title}")
-                    self._post_to_zulip(content)
-                    self.seen_items.add(story_id)
-
-                    # Rate limiting
-                    time.sleep(2)
+                    self._queue_to_zulip(content, story_id)
 
-                # Delay between keyword searches
-                time.sleep(1)
+                remember_validators(self.validators, search_url, response.headers)
 
-        except Exception as e:
-            self.logger.error(f"Error checking Hacker News: {e}")
+            except Exception as e:
+                self.logger.error(f"Error checking Hacker News for '{keyword}': {e}")
 
-    def check_anthropic_site(self):
-        """Check Anthropic's website for skills-related content using site: search."""
+    def check_anthropic_site(self, fetches):
+        """Process the fetched Anthropic site search for skills-related content."""
         if not self.config.get("sources", {}).get("anthropic_site", {}).get("enabled", False):
             return
 
         site_config = self.config["sources"]["anthropic_site"]
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=site_config.get("max_age_hours", 168))
 
-        try:
-            # Use Google News RSS with site: operator
-            import urllib.parse
-            query = "site:anthropic.com skills"
-            encoded_query = urllib.parse.quote(query)
-            url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-
-            self.logger.info(f"Checking Anthropic site for skills mentions")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            # Parse RSS feed
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-
-            for item in root.findall(".//item"):
-                title_elem = item.find("title")
-                link_elem = item.find("link")
-                pub_date_elem = item.find("pubDate")
-                description_elem = item.find("description")
-
-                if title_elem is None or link_elem is None:
+        for query, url, future in fetches:
+            try:
+                self.logger.info(f"Checking Anthropic site for skills mentions")
+                response, items = future.result()
+                if items is None:
+                    self.logger.debug("Anthropic site results unchanged")
                     continue
 
-                title = title_elem.text
-                link = link_elem.text
-                description = description_elem.text if description_elem is not None else ""
+                # Items were parsed on the fetching thread as the feed streamed in
+                for title, link, pub_date_str, description in items:
+                    # Create unique ID
+                    news_id = make_item_id("anthropic_site", link)
 
-                # Create unique ID
-                news_id = f"anthropic_site_{hash(link)}"
+                    if news_id in self.seen_items or news_id in self.post_queue:
+                        continue
 
-                if news_id in self.seen_items:
-                    continue
+                    # For anthropic.com content, we're more lenient but still filter
+                    if not self._is_relevant_skills_article(title, description):
+                        self.seen_items.add(news_id)
+                        continue
 
-                # For anthropic.com content, we're more lenient but still filter
-                if not self._is_relevant_skills_article(title, description):
-                    self.seen_items.add(news_id)
-                    continue
+                    # Parse publication date
+                    if pub_date_str:
+                        try:
+                            pub_date = parsedate_to_datetime(pub_date_str)
+                            if pub_date < cutoff:
+                                self.seen_items.add(news_id)
+                                continue
 
-                # Parse publication date
-                if pub_date_elem is not None:
-                    pub_date_str = pub_date_elem.text
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        pub_date = parsedate_to_datetime(pub_date_str)
-                        hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
-
-                        max_age_hours = site_config.get("max_age_hours", 168)
-                        if hours_old > max_age_hours:
-                            self.seen_items.add(news_id)
-                            continue
-
-                        date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse date: {e}")
+                            date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
+                        except Exception as e:
+                            self.logger.warning(f"Failed to parse date: {e}")
+                            date_str = "Unknown"
+                    else:
                         date_str = "Unknown"
-                else:
-                    date_str = "Unknown"
 
-                content = (
-                    f"**ANTHROPIC.COM UPDATE: {title}**\n"
-                    f"**Published:** {date_str}\n"
-                    f"**URL:** {link}\n\n"
-                    f"_Direct content from Anthropic's website mentioning skills._"
-                )
+                    content = (
+                        f"**ANTHROPIC.COM UPDATE: {title}**\n"
+                        f"**Published:** {date_str}\n"
+                        f"**URL:** {link}\n\n"
+                        f"_Direct content from Anthropic's website mentioning skills._"
+                    )
 
-                self.logger.info(f"POSTING: {title}")
-                self._post_to_zulip(content)
-                self.seen_items.add(news_id)
+                    self.logger.info(f"POSTING: {title}")
+                    self._queue_to_zulip(content, news_id)
 
-                # Rate limiting
-                time.sleep(2)
+                remember_validators(self.validators, url, response.headers)
 
-        except Exception as e:
-            self.logger.error(f"Error checking Anthropic site: {e}")
+            except Exception as e:
+                self.logger.error(f"Error checking Anthropic site: {e}")
 
     def check_all_sources(self):
         """Check all configured sources for new content."""
         self.logger.info("Checking all sources for Claude Skills news...")
 
         try:
-            self.check_google_news()
-            self.check_hackernews()
-            self.check_anthropic_site()
-
-            # Save seen items after each check cycle
+            # Start every source's requests up front so the cycle's network
+            # time is roughly that of the slowest request, not the sum of all
+            google_fetches = self._fetch_concurrently(self.google_news_urls, self._fetch_feed_items)
+            hn_fetches = self._fetch_concurrently(self.hackernews_urls, self._fetch_json)
+            site_fetches = self._fetch_concurrently(self.anthropic_site_urls, self._fetch_feed_items)
+
+            self.check_google_news(google_fetches)
+            self.check_hackernews(hn_fetches)
+            self.check_anthropic_site(site_fetches)
+
+            # Post everything found this cycle in batched messages; items are
+            # only marked seen once posted, and failed posts stay queued
+            posted = self.post_queue.flush()
+
+            # Save seen items and HTTP validators after each check cycle. While
+            # posts are still queued, keep the validators saved before them so a
+            # restart refetches their sources instead of getting 304s
             self._save_seen_items()
+            if posted:
+                save_validators(self.validators_file, self.validators, self.logger)
 
         except Exception as e:
             self.logger.error(f"Error during source check: {e}")
@@ -504,10 +673,19 @@ class ClaudeSkillsBot:
             if source_config.get("enabled", False):
                 self.logger.info(f"Monitoring source: {source_name}")
 
-        while True:
+        # Docker sends SIGTERM on stop; wake from the sleep and exit cleanly
+        # instead of being killed after the grace period
+        signal.signal(signal.SIGTERM, lambda signum, frame: self._stop_event.set())
+
+        while not self._stop_event.is_set():
             self.check_all_sources()
             self.logger.info(f"Sleeping for {poll_interval} seconds...")
-            time.sleep(poll_interval)
+            self._stop_event.wait(poll_interval)
+
+        self.logger.info("Received SIGTERM, shutting down")
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._save_seen_items()
+        self.seen_items.close()
 
 
 def main():
@@ -7,11 +7,20 @@ Filters by recipient address to route to appropriate Zulip instances.
 """
 
 import os
+import re
 import sys
+import json
 import time
+import random
+import hmac
 import base64
 import logging
 import argparse
+import string
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -20,11 +29,62 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 import zulip
 
+# Add parent directory to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.common import state_dir
+
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Gmail API scope - read-only access
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# Bare email addresses within a To/Delivered-To header value
+EMAIL_ADDRESS_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+')
+
+# Headers whose addresses are matched against targets' watch_addresses
+RECIPIENT_HEADERS = ("To", "Delivered-To", "X-Original-To")
+
+# Retries for a single Gmail request on 429/5xx/rate-limit 403 responses;
+# googleapiclient backs off exponentially with jitter between attempts
+GMAIL_RETRIES = 5
+
+# Retries for a Zulip send rejected by its rate limit
+ZULIP_RETRIES = 3
+
+# Longest poll interval to back off to while Gmail keeps rate limiting us
+MAX_POLL_BACKOFF_SECONDS = 900
+
+# Only the headers _extract_email_info reads, and only the parts of each
+# message response it uses (the snippet is added if a template shows it)
+METADATA_HEADERS = ["From", "To", "Subject", "Date", "Delivered-To", "X-Original-To"]
+MESSAGE_FIELDS = "id,threadId,payload/headers"
+
+# Variables used by the built-in notification format (no template configured)
+DEFAULT_FORMAT_FIELDS = {"to_addr", "from_addr", "subject", "snippet"}
+
+# Gmail watches expire after 7 days; Google recommends renewing daily
+WATCH_RENEWAL_SECONDS = 24 * 60 * 60
+
+# Zulip rejects messages longer than this
+ZULIP_MAX_MESSAGE_LENGTH = 10000
+
+# Separator between notifications combined into one Zulip message
+NOTIFICATION_SEPARATOR = "\n\n---\n\n"
+
+# Number of recently processed message IDs remembered
+PROCESSED_IDS_LIMIT = 1000
+
+# Message fetches per batch request; Gmail allows 100 but recommends at most
+# 50 to avoid rate limiting
+BATCH_SIZE = 50
+
 
 class EmailNotifier:
     """Bot that watches Gmail and posts notifications to Zulip."""
@@ -35,13 +95,20 @@ class EmailNotifier:
         self.logger = logging.getLogger("email_notifier")
         self.gmail = self._create_gmail_client()
         self.zulip_clients = self._create_zulip_clients()
-        self.processed_ids: set[str] = set()
+        # One worker per target, so each target's posts go out concurrently
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(self.zulip_clients)))
+        self.address_targets, self.domain_targets = self._build_routing_index()
+        self.message_fields = self._compile_templates()
+        self.processed_ids: dict[str, None] = {}  # Insertion-ordered, oldest first
         self.last_check_time = datetime.now(timezone.utc)
+        self.state_path = state_dir(Path(__file__).parent) / "history_state.json"
+        self.last_history_id = self._load_history_id()
+        self.wake = threading.Event()  # Set by Gmail push notifications
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
         with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
 
     def _setup_logging(self):
         """Configure logging based on config."""
@@ -91,7 +158,9 @@ class EmailNotifier:
                 token.write(creds.to_json())
             self.logger.info(f"Saved Gmail token to {token_path}")
 
-        return build("gmail", "v1", credentials=creds)
+        # Use the discovery document bundled with google-api-python-client
+        # rather than fetching it from googleapis.com on every start
+        return build("gmail", "v1", credentials=creds, static_discovery=True, cache_discovery=False)
 
     def _create_zulip_clients(self) -> dict:
         """Create Zulip clients for each configured target."""
@@ -114,42 +183,169 @@ class EmailNotifier:
             self.logger.info(f"Created Zulip client for {name} -> {target['zulip_site']}")
         return clients
 
-    def _get_target_for_recipient(self, to_address: str) -> dict | None:
-        """Find the target config for a given recipient address."""
-        to_lower = to_address.lower()
+    def _load_history_id(self) -> str:
+        """Load the Gmail historyId to sync from, starting from the mailbox's current one."""
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, "r") as f:
+                    history_id = json.load(f).get("history_id")
+                if history_id:
+                    return history_id
+            except Exception as e:
+                self.logger.warning(f"Failed to load Gmail sync state: {e}")
+        return self._current_history_id()
+
+    def _save_history_id(self):
+        """Save the Gmail historyId synced up to."""
+        try:
+            with open(self.state_path, "w") as f:
+                json.dump({"history_id": self.last_history_id}, f)
+        except Exception as e:
+            self.logger.error(f"Failed to save Gmail sync state: {e}")
+
+    def _current_history_id(self) -> str:
+        """Get the mailbox's current historyId; mail already received is not notified."""
+        history_id = self.gmail.users().getProfile(userId="me").execute(num_retries=GMAIL_RETRIES)["historyId"]
+        self.logger.info(f"Starting Gmail sync from historyId {history_id}")
+        return history_id
+
+    def _list_added_messages(self) -> tuple[list[str], str]:
+        """List IDs of inbox messages added since last_history_id.
+
+        Returns (message_ids, history_id), where history_id is the point
+        to sync from next time.
+        """
+        history = self.gmail.users().history()
+        request = history.list(
+            userId="me",
+            startHistoryId=self.last_history_id,
+            historyTypes=["messageAdded"],
+            labelId="INBOX",
+        )
+
+        message_ids = []
+        while request is not None:
+            results = request.execute(num_retries=GMAIL_RETRIES)
+            for record in results.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    message_ids.append(added["message"]["id"])
+            request = history.list_next(request, results)
+
+        # A message can appear in several history records; keep the first
+        return list(dict.fromkeys(message_ids)), results["historyId"]
+
+    def _mark_processed(self, msg_id: str):
+        """Remember a processed message ID, forgetting the oldest past PROCESSED_IDS_LIMIT."""
+        self.processed_ids[msg_id] = None
+        if len(self.processed_ids) > PROCESSED_IDS_LIMIT:
+            del self.processed_ids[next(iter(self.processed_ids))]
+
+    def _fetch_messages(self, message_ids: list[str]) -> list[dict]:
+        """Fetch message metadata for message_ids using batch requests.
+
+        Returns the messages in the order given, leaving out any that were
+        deleted before they could be read. Any other failure is raised once
+        the batch completes.
+        """
+        fetched = {}
+        errors = []
+
+        def on_fetched(request_id, response, exception):
+            if exception is None:
+                fetched[request_id] = response
+            elif isinstance(exception, HttpError) and exception.resp.status == 404:
+                self.logger.debug(f"Message {request_id} was deleted before it could be read")
+            else:
+                errors.append(exception)
+
+        messages = self.gmail.users().messages()
+        for start in range(0, len(message_ids), BATCH_SIZE):
+            batch = self.gmail.new_batch_http_request(callback=on_fetched)
+            for msg_id in message_ids[start:start + BATCH_SIZE]:
+                batch.add(
+                    messages.get(
+                        userId="me",
+                        id=msg_id,
+                        format="metadata",
+                        metadataHeaders=METADATA_HEADERS,
+                        fields=self.message_fields,
+                    ),
+                    request_id=msg_id,
+                )
+            batch.execute()
+            if errors:
+                raise errors[0]
+
+        return [fetched[msg_id] for msg_id in message_ids if msg_id in fetched]
+
+    def _compile_templates(self) -> str:
+        """Record the variables each target's template uses, as target["_fields"].
+
+        Returns the Gmail message fields to request: the snippet is only
+        fetched when some target's notification shows it.
+        """
+        for target in self.config.get("targets", []):
+            template = target.get("message_template", self.config.get("default_template"))
+            if template:
+                target["_fields"] = {
+                    field_name for _, field_name, _, _ in string.Formatter().parse(template) if field_name
+                }
+            else:
+                target["_fields"] = DEFAULT_FORMAT_FIELDS
+
+        if any("snippet" in target["_fields"] for target in self.config.get("targets", [])):
+            return f"{MESSAGE_FIELDS},snippet"
+        return MESSAGE_FIELDS
+
+    def _build_routing_index(self) -> tuple[dict, dict]:
+        """Index targets by watched address and by wildcard domain.
+
+        Returns (address_targets, domain_targets), both keyed by lowercase
+        address or domain. If several targets watch the same address or
+        domain, the first one in the config wins.
+        """
+        address_targets = {}
+        domain_targets = {}
         for target in self.config.get("targets", []):
             for pattern in target.get("watch_addresses", []):
                 # Support wildcards like *@dollhousemcp.com
                 if pattern.startswith("*@"):
-                    domain = pattern[2:].lower()
-                    if to_lower.endswith(f"@{domain}"):
-                        return target
-                elif to_lower == pattern.lower():
-                    return target
-        return None
+                    domain_targets.setdefault(pattern[2:].lower(), target)
+                else:
+                    address_targets.setdefault(pattern.lower(), target)
+        return address_targets, domain_targets
+
+    def _get_target_for_recipient(self, to_address: str) -> dict | None:
+        """Find the target config for a given recipient address.
+
+        An exact address match takes precedence over a wildcard domain.
+        """
+        to_lower = to_address.lower()
+        target = self.address_targets.get(to_lower)
+        if target is None:
+            target = self.domain_targets.get(to_lower.rpartition("@")[2])
+        return target
 
     def _extract_email_info(self, msg_data: dict) -> dict:
         """Extract relevant info from Gmail message."""
         headers = msg_data.get("payload", {}).get("headers", [])
 
+        # Header names are case-insensitive; built in reverse so that, as
+        # with a front-to-back scan, the first of a repeated header wins
+        header_values = {h["name"].lower(): h["value"] for h in reversed(headers)}
+
         def get_header(name: str) -> str:
-            for h in headers:
-                if h["name"].lower() == name.lower():
-                    return h["value"]
-            return ""
+            return header_values.get(name.lower(), "")
 
         # Get snippet (preview text)
         snippet = msg_data.get("snippet", "")
 
-        # Get all recipients (To, Cc)
-        to_addresses = []
-        for field in ["To", "Delivered-To", "X-Original-To"]:
-            value = get_header(field)
-            if value:
-                # Parse out just the email addresses
-                import re
-                emails = re.findall(r'[\w\.-]+@[\w\.-]+', value)
-                to_addresses.extend(emails)
+        # Get all recipients, parsing out just the email addresses
+        to_addresses = [
+            address
+            for field in RECIPIENT_HEADERS
+            for address in EMAIL_ADDRESS_PATTERN.findall(get_header(field))
+        ]
 
         return {
             "id": msg_data["id"],
@@ -166,13 +362,16 @@ class EmailNotifier:
         template = target.get("message_template", self.config.get("default_template"))
 
         if template:
-            return template.format(
-                from_addr=email_info["from"],
-                to_addr=matched_address,
-                subject=email_info["subject"],
-                snippet=email_info["snippet"][:200],
-                date=email_info["date"],
-            )
+            values = {
+                "from_addr": email_info["from"],
+                "to_addr": matched_address,
+                "subject": email_info["subject"],
+                "date": email_info["date"],
+            }
+            # Only cut the preview if the template shows it
+            if "snippet" in target["_fields"]:
+                values["snippet"] = email_info["snippet"][:200]
+            return template.format(**values)
 
         # Default format
         return (
@@ -183,7 +382,61 @@ class EmailNotifier:
             f"**Preview:** {email_info['snippet'][:200]}..."
         )
 
-    def _post_to_zulip(self, target: dict, content: str, email_info: dict):
+    def _get_topic(self, target: dict, email_info: dict) -> str:
+        """Get the Zulip topic for an email's notification."""
+        # Topic can be static or based on sender/recipient
+        topic_template = target.get("topic", "notifications")
+        return topic_template.format(
+            from_addr=email_info["from"],
+            subject=email_info["subject"][:50],
+        )
+
+    def _batch_notifications(self, notifications: list[str]) -> list[str]:
+        """Join notifications into as few messages as fit within Zulip's length limit."""
+        batches = []
+        current = ""
+        for notification in notifications:
+            # Templates usually end in a newline; trim so separators stay evenly spaced
+            notification = notification.strip()
+            candidate = f"{current}{NOTIFICATION_SEPARATOR}{notification}" if current else notification
+            if current and len(candidate) > ZULIP_MAX_MESSAGE_LENGTH:
+                batches.append(current)
+                current = notification
+            else:
+                current = candidate
+        if current:
+            batches.append(current)
+        return batches
+
+    def _flush_notifications(self, pending: dict):
+        """Post queued notifications, one combined message per target and topic.
+
+        Targets can be separate Zulip servers, so each target's messages are
+        posted on their own worker thread. A target's messages stay in order
+        on one thread, since its Zulip client isn't shared between threads.
+        """
+        by_target = {}
+        for (name, topic), (target, notifications) in pending.items():
+            by_target.setdefault(name, (target, []))[1].extend(
+                (topic, content) for content in self._batch_notifications(notifications)
+            )
+
+        futures = {
+            self.executor.submit(self._post_all_to_zulip, target, messages): name
+            for name, (target, messages) in by_target.items()
+        }
+        for future, name in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"Error posting to {name}: {e}")
+
+    def _post_all_to_zulip(self, target: dict, messages: list[tuple[str, str]]):
+        """Post (topic, content) messages to one target, in order."""
+        for topic, content in messages:
+            self._post_to_zulip(target, topic, content)
+
+    def _post_to_zulip(self, target: dict, topic: str, content: str):
         """Post notification to Zulip."""
         client = self.zulip_clients.get(target["name"])
         if not client:
@@ -191,98 +444,194 @@ class EmailNotifier:
             return
 
         stream = target.get("stream", "email")
-        # Topic can be static or based on sender/recipient
-        topic_template = target.get("topic", "notifications")
-        topic = topic_template.format(
-            from_addr=email_info["from"],
-            subject=email_info["subject"][:50],
-        )
 
-        result = client.send_message({
-            "type": "stream",
-            "to": stream,
-            "topic": topic,
-            "content": content,
-        })
+        for attempt in range(ZULIP_RETRIES + 1):
+            result = client.send_message({
+                "type": "stream",
+                "to": stream,
+                "topic": topic,
+                "content": content,
+            })
+            # Only rate-limit rejections are retried: the server refused the
+            # message outright, so sending it again cannot post a duplicate
+            if result.get("code") != "RATE_LIMIT_HIT" or attempt == ZULIP_RETRIES:
+                break
+            # Wait as long as Zulip asks, plus jitter, then try again
+            wait = float(result.get("retry-after", 2 ** attempt)) + random.uniform(0, 1)
+            self.logger.warning(f"Zulip rate limit hit, retrying in {wait:.1f}s")
+            time.sleep(wait)
 
         if result.get("result") != "success":
             self.logger.error(f"Failed to send to Zulip: {result}")
         else:
             self.logger.info(f"Posted to {target['name']} #{stream} > {topic}")
 
-    def check_new_emails(self):
-        """Check for new emails and process them."""
-        try:
-            # Query for unread emails in inbox
-            query = "is:unread in:inbox"
+    @staticmethod
+    def _is_rate_limited(error: HttpError) -> bool:
+        """Whether a Gmail error means we are over quota rather than a real failure."""
+        status = error.resp.status
+        return status == 429 or (status == 403 and "rate limit" in str(error.reason).lower())
 
-            # Add time filter to avoid processing old emails on startup
-            poll_interval = self.config.get("poll_interval_seconds", 60)
+    def check_new_emails(self) -> float | None:
+        """Check for new emails and process them.
 
-            results = self.gmail.users().messages().list(
-                userId="me",
-                q=query,
-                maxResults=20,
-            ).execute()
+        Returns None normally, or if Gmail rate limited the check even after
+        retries, the number of seconds it asked us to wait (0 if it didn't say).
+        """
+        try:
+            # Only messages added since the last successful poll
+            try:
+                messages, history_id = self._list_added_messages()
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                # Gmail only keeps about a week of history
+                self.logger.warning("Gmail history has expired, resyncing from the current mailbox state")
+                self.last_history_id = self._current_history_id()
+                self._save_history_id()
+                return
 
-            messages = results.get("messages", [])
+            # Skip already processed (a failed poll is retried from the same historyId)
+            new_ids = [msg_id for msg_id in messages if msg_id not in self.processed_ids]
 
-            if not messages:
+            if not new_ids:
                 self.logger.debug("No new messages")
-                return
-
-            for msg in messages:
-                msg_id = msg["id"]
-
-                # Skip already processed
-                if msg_id in self.processed_ids:
-                    continue
-
-                # Get full message
-                msg_data = self.gmail.users().messages().get(
-                    userId="me",
-                    id=msg_id,
-                    format="metadata",
-                    metadataHeaders=["From", "To", "Subject", "Date", "Delivered-To", "X-Original-To"],
-                ).execute()
-
-                email_info = self._extract_email_info(msg_data)
-                self.processed_ids.add(msg_id)
-
-                # Check each recipient against targets
-                notified = False
-                for to_addr in email_info["to"]:
-                    target = self._get_target_for_recipient(to_addr)
-                    if target:
-                        content = self._format_notification(email_info, target, to_addr)
-                        self._post_to_zulip(target, content, email_info)
-                        notified = True
-                        break  # Only notify once per email
-
-                if notified:
-                    self.logger.info(f"Processed email: {email_info['subject'][:50]}")
-                else:
-                    self.logger.debug(f"No target for email to: {email_info['to']}")
 
-            # Limit memory usage
-            if len(self.processed_ids) > 1000:
-                self.processed_ids = set(list(self.processed_ids)[-500:])
+            # Notifications queued per (target name, topic), so a burst of
+            # mail goes out as one message per topic instead of one per email
+            pending = {}
+            try:
+                for msg_data in self._fetch_messages(new_ids):
+                    email_info = self._extract_email_info(msg_data)
+                    self._mark_processed(msg_data["id"])
+
+                    # Check each recipient against targets
+                    notified = False
+                    for to_addr in email_info["to"]:
+                        target = self._get_target_for_recipient(to_addr)
+                        if target:
+                            content = self._format_notification(email_info, target, to_addr)
+                            topic = self._get_topic(target, email_info)
+                            pending.setdefault((target["name"], topic), (target, []))[1].append(content)
+                            notified = True
+                            break  # Only notify once per email
+
+                    if notified:
+                        self.logger.info(f"Processed email: {email_info['subject'][:50]}")
+                    else:
+                        self.logger.debug(f"No target for email to: {email_info['to']}")
+            finally:
+                # Emails already marked processed must be posted even if a
+                # later one failed
+                self._flush_notifications(pending)
+
+            if history_id != self.last_history_id:
+                self.last_history_id = history_id
+                self._save_history_id()
+
+        except HttpError as e:
+            if not self._is_rate_limited(e):
+                self.logger.error(f"Error checking emails: {e}")
+                return None
+            self.logger.warning(f"Gmail rate limit hit: {e}")
+            try:
+                return float(e.resp.get("retry-after", 0))
+            except ValueError:
+                return 0.0
 
         except Exception as e:
             self.logger.error(f"Error checking emails: {e}")
 
+        return None
+
+    def _start_push_server(self, push_config: dict):
+        """Serve Pub/Sub push requests, waking the main loop for each one.
+
+        The push body only says that the mailbox changed; the main loop
+        then syncs history from the stored historyId as it does when polling.
+        The subscription's push endpoint must carry ?token=<verification_token>.
+        """
+        token = push_config["verification_token"]
+        if token.startswith("${") and token.endswith("}"):
+            env_var = token[2:-1]
+            token = os.environ.get(env_var)
+            if not token:
+                raise ValueError(f"Environment variable {env_var} not set")
+
+        bot = self
+
+        class PushHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                supplied = query.get("token", [""])[0]
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not hmac.compare_digest(supplied.encode(), token.encode()):
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+                # Acknowledge straight away so Pub/Sub doesn't redeliver
+                self.send_response(204)
+                self.end_headers()
+                bot.wake.set()
+
+            def log_message(self, format, *args):
+                bot.logger.debug(f"Push request: {format % args}")
+
+        port = push_config.get("port", 8080)
+        server = ThreadingHTTPServer(("", port), PushHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.logger.info(f"Listening for Gmail push notifications on port {port}")
+
+    def _watch_mailbox(self, push_config: dict):
+        """Ask Gmail to publish inbox changes to the configured Pub/Sub topic."""
+        result = self.gmail.users().watch(
+            userId="me",
+            body={"topicName": push_config["topic"], "labelIds": ["INBOX"]},
+        ).execute(num_retries=GMAIL_RETRIES)
+        self.logger.info(f"Watching Gmail inbox via {push_config['topic']} (historyId {result['historyId']})")
+
     def run(self):
-        """Main loop - poll Gmail and post notifications."""
+        """Main loop - sync Gmail when notified (or polled) and post notifications."""
         poll_interval = self.config.get("poll_interval_seconds", 60)
-        self.logger.info(f"Starting Email Notifier (polling every {poll_interval}s)...")
+
+        # With push enabled, polling only catches anything a push missed
+        push_config = self.config.get("push", {})
+        if push_config.get("enabled", False):
+            poll_interval = push_config.get("poll_interval_seconds", 900)
+            self._start_push_server(push_config)
+            self.logger.info(f"Starting Email Notifier (push, polling every {poll_interval}s)...")
+        else:
+            self.logger.info(f"Starting Email Notifier (polling every {poll_interval}s)...")
 
         # List watched addresses
         for target in self.config.get("targets", []):
             self.logger.info(f"Watching {target['watch_addresses']} -> {target['name']}")
 
+        # Poll less often while Gmail is rate limiting us, and return to the
+        # configured interval after the first successful check
+        delay = poll_interval
+        watch_renewal_at = 0.0
         while True:
-            self.check_new_emails()
-            time.sleep(poll_interval)
+            if push_config.get("enabled", False) and time.monotonic() >= watch_renewal_at:
+                try:
+                    self._watch_mailbox(push_config)
+                    watch_renewal_at = time.monotonic() + WATCH_RENEWAL_SECONDS
+                except Exception as e:
+                    # Polling carries on; try again next cycle
+                    self.logger.error(f"Failed to watch Gmail inbox: {e}")
+
+            self.wake.clear()
+            retry_after = self.check_new_emails()
+            if retry_after is None:
+                delay = poll_interval
+            else:
+                delay = max(min(delay * 2, MAX_POLL_BACKOFF_SECONDS), retry_after)
+                self.logger.warning(f"Backing off, next Gmail check in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+
+            # Sleep until the next poll, or until a push says mail arrived
+            self.wake.wait(delay)
 
 
 def main():
@@ -9,30 +9,70 @@ Useful for transforming verbose webhook output into clean, emoji-rich notificati
 import os
 import re
 import sys
-import time
 import logging
 import argparse
+import string
 from typing import Optional
 from pathlib import Path
 
 import yaml
 import zulip
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Number of recently processed message IDs remembered
+PROCESSED_IDS_LIMIT = 10000
+
+# Variables extracted from message content for templates
+BRANCH_PATTERN = re.compile(r"branch[:\s]+[`\"]?([^`\"\s]+)[`\"]?", re.IGNORECASE)
+URL_PATTERN = re.compile(r"https?://[^\s\)]+")
+PR_NUMBER_PATTERN = re.compile(r"#(\d+)")
+TITLE_PATTERN = re.compile(r"\*\*([^*]+)\*\*")
+
 
 class FormatterBot:
     """Bot that watches streams and reposts formatted messages."""
 
     def __init__(self, config_path: str):
         self.config = self._load_config(config_path)
+        self._compile_rules()
         self._setup_logging()
         self.client = self._create_client()
-        self.processed_ids: set[int] = set()  # Track processed message IDs
+        self.processed_ids: dict[int, None] = {}  # Track processed message IDs, oldest first
         self.logger = logging.getLogger("formatter_bot")
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
         with open(config_path, "r") as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
+
+    def _compile_rules(self):
+        """Compile each rule's topic and content regexes once, at config load."""
+        for rule in self.config.get("rules", []):
+            topic_pattern = rule.get("source", {}).get("topic_pattern")
+            rule["_topic_re"] = re.compile(topic_pattern, re.IGNORECASE) if topic_pattern else None
+
+            for pattern_def in rule.get("match", {}).get("patterns", []):
+                pattern_def["_re"] = re.compile(pattern_def.get("pattern", ""), re.IGNORECASE)
+            rule["_fields"] = self._template_fields(rule)
+
+    @staticmethod
+    def _template_fields(rule: dict) -> set[str]:
+        """Collect the variable names a rule's format and topic templates use."""
+        templates = [t for t in rule.get("format", {}).values() if t]
+        templates.append(rule.get("target", {}).get("topic", "{source_topic}"))
+
+        fields = set()
+        for template in templates:
+            for _, field_name, _, _ in string.Formatter().parse(template):
+                if field_name:
+                    # "{title.upper}" or "{repo[0]}" still needs "title"/"repo"
+                    fields.add(re.split(r"[.\[]", field_name, maxsplit=1)[0])
+        return fields
 
     def _setup_logging(self):
         """Configure logging based on config."""
@@ -79,52 +119,55 @@ class FormatterBot:
             return False
 
         # Check topic pattern
-        topic_pattern = source.get("topic_pattern")
-        if topic_pattern:
-            if not re.search(topic_pattern, message.get("subject", ""), re.IGNORECASE):
+        topic_re = rule["_topic_re"]
+        if topic_re:
+            if not topic_re.search(message.get("subject", "")):
                 return False
 
         return True
 
-    def _extract_variables(self, message: dict) -> dict:
-        """Extract common variables from message for template substitution."""
+    def _extract_variables(self, message: dict, fields: set[str]) -> dict:
+        """Extract variables from message for template substitution.
+
+        Variables found by scanning the content (branch, url, number, title)
+        and repo are only computed when named in fields.
+        """
         content = message.get("content", "")
         subject = message.get("subject", "")
 
+        variables = {
+            "source_topic": subject,
+            "author": message.get("sender_full_name", ""),
+            "content": content,
+            "short_summary": content[:100] + "..." if len(content) > 100 else content,
+        }
+
         # Parse topic for repo info (e.g., "DollhouseMCP/mcp-server/checks")
-        topic_parts = subject.split("/")
-        repo = "/".join(topic_parts[:2]) if len(topic_parts) >= 2 else subject
+        if "repo" in fields:
+            topic_parts = subject.split("/")
+            variables["repo"] = "/".join(topic_parts[:2]) if len(topic_parts) >= 2 else subject
 
         # Try to extract branch from content
-        branch_match = re.search(r"branch[:\s]+[`\"]?([^`\"\s]+)[`\"]?", content, re.IGNORECASE)
-        branch = branch_match.group(1) if branch_match else "unknown"
+        if "branch" in fields:
+            branch_match = BRANCH_PATTERN.search(content)
+            variables["branch"] = branch_match.group(1) if branch_match else "unknown"
 
         # Try to extract URL
-        url_match = re.search(r"https?://[^\s\)]+", content)
-        url = url_match.group(0) if url_match else ""
+        if "url" in fields:
+            url_match = URL_PATTERN.search(content)
+            variables["url"] = url_match.group(0) if url_match else ""
 
         # Try to extract PR info
-        pr_match = re.search(r"#(\d+)", content)
-        pr_number = pr_match.group(1) if pr_match else ""
+        if "number" in fields:
+            pr_match = PR_NUMBER_PATTERN.search(content)
+            variables["number"] = pr_match.group(1) if pr_match else ""
 
         # Try to extract title (usually in bold or after certain keywords)
-        title_match = re.search(r"\*\*([^*]+)\*\*", content)
-        title = title_match.group(1) if title_match else ""
+        if "title" in fields:
+            title_match = TITLE_PATTERN.search(content)
+            variables["title"] = title_match.group(1) if title_match else ""
 
-        # Author
-        author = message.get("sender_full_name", "")
-
-        return {
-            "source_topic": subject,
-            "repo": repo,
-            "branch": branch,
-            "url": url,
-            "number": pr_number,
-            "title": title,
-            "author": author,
-            "content": content,
-            "short_summary": content[:100] + "..." if len(content) > 100 else content,
-        }
+        return variables
 
     def _match_pattern(self, content: str, rule: dict) -> Optional[str]:
         """Find which pattern matches the content, return pattern name."""
@@ -132,32 +175,24 @@ class FormatterBot:
         patterns = match_config.get("patterns", [])
 
         for pattern_def in patterns:
-            pattern = pattern_def.get("pattern", "")
-            if re.search(pattern, content, re.IGNORECASE):
+            if pattern_def["_re"].search(content):
                 return pattern_def.get("name")
 
         return None
 
-    def _format_message(self, message: dict, rule: dict) -> Optional[str]:
-        """Apply formatting rule to message, return formatted content or None."""
-        content = message.get("content", "")
-
+    def _select_template(self, message: dict, rule: dict) -> Optional[str]:
+        """Pick the rule's format template for message, or None to not repost."""
         # Find matching pattern
-        pattern_name = self._match_pattern(content, rule)
+        pattern_name = self._match_pattern(message.get("content", ""), rule)
 
         # Get format template
         format_config = rule.get("format", {})
         if pattern_name:
-            template = format_config.get(pattern_name)
-        else:
-            template = format_config.get("default")
+            return format_config.get(pattern_name)
+        return format_config.get("default")
 
-        # None means don't repost
-        if template is None:
-            return None
-
-        # Extract variables and substitute
-        variables = self._extract_variables(message)
+    def _format_message(self, template: str, variables: dict) -> Optional[str]:
+        """Fill in a format template, return formatted content or None."""
         try:
             formatted = template.format(**variables)
             return formatted.strip()
@@ -165,10 +200,9 @@ class FormatterBot:
             self.logger.warning(f"Missing template variable: {e}")
             return None
 
-    def _get_target(self, message: dict, rule: dict) -> tuple[str, str]:
+    def _get_target(self, message: dict, rule: dict, variables: dict) -> tuple[str, str]:
         """Get target stream and topic for reformatted message."""
         target = rule.get("target", {})
-        variables = self._extract_variables(message)
 
         stream = target.get("stream", message.get("display_recipient"))
         topic = target.get("topic", "{source_topic}").format(**variables)
@@ -196,11 +230,11 @@ class FormatterBot:
         # Skip if already processed
         if msg_id in self.processed_ids:
             return
-        self.processed_ids.add(msg_id)
+        self.processed_ids[msg_id] = None
 
-        # Limit memory usage
-        if len(self.processed_ids) > 10000:
-            self.processed_ids = set(list(self.processed_ids)[-5000:])
+        # Limit memory usage by forgetting the oldest ID
+        if len(self.processed_ids) > PROCESSED_IDS_LIMIT:
+            del self.processed_ids[next(iter(self.processed_ids))]
 
         # Skip messages from self (prevent loops)
         if message.get("sender_email") == os.environ.get("ZULIP_EMAIL"):
@@ -213,9 +247,16 @@ class FormatterBot:
 
             self.logger.debug(f"Rule '{rule.get('name')}' matched message {msg_id}")
 
-            formatted = self._format_message(message, rule)
+            # None means don't repost
+            template = self._select_template(message, rule)
+            if template is None:
+                continue
+
+            # Extract variables once for both the content and the topic
+            variables = self._extract_variables(message, rule["_fields"])
+            formatted = self._format_message(template, variables)
             if formatted:
-                stream, topic = self._get_target(message, rule)
+                stream, topic = self._get_target(message, rule, variables)
                 self._post_formatted(stream, topic, formatted)
                 # Only apply first matching rule
                 break
@@ -226,57 +267,47 @@ class FormatterBot:
 
         # Get streams to watch
         streams_to_watch = set()
+        watches_any_stream = False
         for rule in self._get_enabled_rules():
             source_stream = rule.get("source", {}).get("stream")
             if source_stream:
                 streams_to_watch.add(source_stream)
+            else:
+                watches_any_stream = True
 
         self.logger.info(f"Watching streams: {streams_to_watch}")
 
-        # Register event queue
-        # We'll use all_public_streams for simplicity, filtered by our rules
-        result = self.client.register(
+        # Have the server drop messages from other streams before sending
+        # them. Narrow terms are ANDed, so this only works when every rule
+        # watches the same single stream; otherwise take all public streams
+        # and let our rules filter them.
+        narrow = []
+        if len(streams_to_watch) == 1 and not watches_any_stream:
+            narrow = [["stream", next(iter(streams_to_watch))]]
+
+        # Register an event queue and handle events as they arrive. The
+        # client re-registers by itself if the server expires the queue, and
+        # retries with backoff if the server is unreachable.
+        self.client.call_on_each_event(
+            self._handle_event,
             event_types=["message"],
+            narrow=narrow,
             all_public_streams=True,
         )
 
-        if result.get("result") != "success":
-            self.logger.error(f"Failed to register queue: {result}")
-            sys.exit(1)
-
-        queue_id = result["queue_id"]
-        last_event_id = result["last_event_id"]
-
-        self.logger.info(f"Registered queue: {queue_id}")
-
-        # Event loop
-        while True:
-            try:
-                events = self.client.get_events(
-                    queue_id=queue_id,
-                    last_event_id=last_event_id,
-                    dont_block=False,
-                )
-
-                if events.get("result") != "success":
-                    self.logger.error(f"Failed to get events: {events}")
-                    time.sleep(5)
-                    continue
-
-                for event in events.get("events", []):
-                    last_event_id = max(last_event_id, event.get("id", last_event_id))
-
-                    if event.get("type") == "message":
-                        message = event.get("message", {})
-                        # Only process stream messages
-                        if message.get("type") == "stream":
-                            self.process_message(message)
-                    elif event.get("type") == "heartbeat":
-                        self.logger.debug("Heartbeat received")
-
-            except Exception as e:
-                self.logger.error(f"Error in event loop: {e}")
-                time.sleep(5)
+    def _handle_event(self, event: dict):
+        """Handle one event from the Zulip event queue."""
+        try:
+            if event.get("type") == "message":
+                message = event.get("message", {})
+                # Only process stream messages
+                if message.get("type") == "stream":
+                    self.process_message(message)
+            elif event.get("type") == "heartbeat":
+                self.logger.debug("Heartbeat received")
+        except Exception as e:
+            # Keep the event loop running after a bad message
+            self.logger.error(f"Error handling event {event.get('id')}: {e}")
 
 
 def main():
@@ -10,27 +10,46 @@ Google News as a workaround to find LinkedIn articles that appear in search resu
 """
 
 import sys
-import time
 import argparse
-import urllib.request
 import urllib.parse
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
 
+import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
+
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.base_bot import BaseNewsBot
+from shared.rate_limit import TokenBucket
 
 
 class LinkedInNewsBot(BaseNewsBot):
     """Bot that monitors LinkedIn content via Google News and posts to Zulip."""
 
     GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search"
+    # Locale parameters appended to every search, encoded once
+    GOOGLE_NEWS_LOCALE_QS = urllib.parse.urlencode({"hl": "en-US", "gl": "US", "ceid": "US:en"})
+
+    # Sustained Google News request rate (one every 2 seconds)
+    GOOGLE_NEWS_REQUESTS_PER_SECOND = 0.5
+    FETCH_WORKERS = 4
 
     def __init__(self, config_path: str):
         super().__init__(config_path, bot_name="linkedin_news_bot")
+        self.http = self._create_http_session()
+        self.google_news_limit = TokenBucket(rate=self.GOOGLE_NEWS_REQUESTS_PER_SECOND, capacity=1)
+
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session so searches reuse connections to Google News."""
+        session = requests.Session()
+        session.headers["User-Agent"] = "LinkedInNewsBot/1.0 (Zulip Integration)"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.FETCH_WORKERS)
+        session.mount("https://", adapter)
+        return session
 
     def check_all_sources(self):
         """Check all configured sources."""
@@ -46,69 +65,94 @@ class LinkedInNewsBot(BaseNewsBot):
         source_config = self.config["sources"]["google_news_linkedin"]
         queries = source_config.get("queries", [])
         max_age_hours = source_config.get("max_age_hours", 168)
-
-        for query in queries:
-            try:
-                self._search_google_news(query, max_age_hours)
-                # Rate limiting between queries
-                time.sleep(2)
-            except Exception as e:
-                self.logger.error(f"Error searching Google News for '{query}': {e}")
-
-    def _search_google_news(self, query: str, max_age_hours: int):
-        """Execute a Google News search for LinkedIn content."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+
+        # Fetch on worker threads (still rate limited) and parse each feed
+        # on this thread while the next request is in flight
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            futures = {executor.submit(self._search_google_news, query): query for query in queries}
+
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to fetch Google News RSS for '{query}': {e}")
+                    continue
+
+                try:
+                    with response:
+                        self._process_feed(response.raw, query, cutoff)
+                except Exception as e:
+                    self.logger.error(f"Error searching Google News for '{query}': {e}")
+
+    def _search_google_news(self, query: str) -> requests.Response:
+        """Start fetching the Google News RSS search results for LinkedIn content.
+
+        Returns the response as soon as its headers arrive; the body is left
+        on the connection to be parsed as it streams in. Only the start of
+        each request is rate limited, so one slow response doesn't hold up
+        the next request once a token is available.
+        """
         # Combine query with site:linkedin.com filter
         full_query = f"{query} site:linkedin.com"
 
-        params = {
-            "q": full_query,
-            "hl": "en-US",
-            "gl": "US",
-            "ceid": "US:en"
-        }
+        url = f"{self.GOOGLE_NEWS_RSS_URL}?q={urllib.parse.quote_plus(full_query)}&{self.GOOGLE_NEWS_LOCALE_QS}"
 
-        url = f"{self.GOOGLE_NEWS_RSS_URL}?{urllib.parse.urlencode(params)}"
+        self.google_news_limit.acquire()
         self.logger.debug(f"Searching Google News: {full_query}")
 
+        response = self.http.get(url, timeout=30, stream=True)
         try:
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "LinkedInNewsBot/1.0 (Zulip Integration)"
-            })
-            with urllib.request.urlopen(req, timeout=30) as response:
-                content = response.read()
-        except Exception as e:
-            self.logger.error(f"Failed to fetch Google News RSS: {e}")
-            return
-
-        # Parse RSS feed
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+
+    def _process_feed(self, source, query: str, cutoff: datetime):
+        """Stream a Google News RSS feed from a file object and process each item.
+
+        Items are handled as soon as their end tag is parsed and freed
+        afterwards, so only one item's subtree is held in memory at a time.
+        """
         try:
-            root = ET.fromstring(content)
-        except ET.ParseError as e:
+            for _, item in etree.iterparse(source, tag="item", resolve_entities=False,
+                                           no_network=True, huge_tree=False):
+                try:
+                    self._process_news_item(item, query, cutoff)
+                except Exception as e:
+                    self.logger.error(f"Error processing news item: {e}")
+                item.clear()
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+        except etree.XMLSyntaxError as e:
             self.logger.error(f"Failed to parse RSS feed: {e}")
-            return
-
-        for item in root.findall(".//item"):
-            try:
-                self._process_news_item(item, query, max_age_hours)
-            except Exception as e:
-                self.logger.error(f"Error processing news item: {e}")
 
-    def _process_news_item(self, item, search_query: str, max_age_hours: int):
+    def _process_news_item(self, item, search_query: str, cutoff: datetime):
         """Process a single news item from Google News RSS."""
         title_elem = item.find("title")
         link_elem = item.find("link")
-        pub_date_elem = item.find("pubDate")
-        source_elem = item.find("source")
 
         if title_elem is None or link_elem is None:
             return
 
-        title = title_elem.text or ""
         link = link_elem.text or ""
+
+        # Verify it's actually a LinkedIn URL (Google News sometimes includes
+        # related articles). The check is cheap, so rejected items skip the
+        # ID hash, seen lookup and date parsing entirely.
+        if "linkedin.com" not in link.lower():
+            return
+
+        title = title_elem.text or ""
+        pub_date_elem = item.find("pubDate")
+        source_elem = item.find("source")
         source = source_elem.text if source_elem is not None else "LinkedIn"
 
-        # Create unique ID from link
-        item_id = f"linkedin_gnews_{hash(link)}"
+        # Create unique ID from link (stable across restarts, unlike hash())
+        item_id = self.make_item_id("linkedin_gnews", link)
 
         if self.is_seen(item_id):
             return
@@ -117,7 +161,9 @@ class LinkedInNewsBot(BaseNewsBot):
         if pub_date_elem is not None and pub_date_elem.text:
             try:
                 pub_date = parsedate_to_datetime(pub_date_elem.text)
-                if self.is_too_old(pub_date, max_age_hours):
+                if pub_date.tzinfo is None:
+                    pub_date = pub_date.replace(tzinfo=timezone.utc)
+                if pub_date < cutoff:
                     self.mark_seen(item_id)
                     return
                 date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
@@ -126,11 +172,6 @@ class LinkedInNewsBot(BaseNewsBot):
         else:
             date_str = "Unknown"
 
-        # Verify it's actually a LinkedIn URL (Google News sometimes includes related articles)
-        if "linkedin.com" not in link.lower():
-            self.mark_seen(item_id)
-            return
-
         # Categorize
         category = self._categorize_item(title)
 
@@ -143,11 +184,7 @@ class LinkedInNewsBot(BaseNewsBot):
             f"**URL:** {link}"
         )
 
-        self._post_to_zulip(category, content)
-        self.mark_seen(item_id)
-
-        # Small delay between posts
-        time.sleep(1)
+        self._queue_to_zulip(category, content, item_id)
 
 
 def main():
@@ -7,19 +7,40 @@ then posts updates to a Zulip channel.
 """
 
 import sys
-import time
 import argparse
-import urllib.request
+import threading
 import urllib.parse
-import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from html import unescape
 from html.parser import HTMLParser
 
+import requests
+from requests.adapters import HTTPAdapter
+
+# orjson parses response bytes directly and several times faster than the
+# stdlib json module; fall back to json without it
+try:
+    import orjson as json_parser
+except ImportError:
+    import json as json_parser
+
+# selectolax (lexbor) tokenizes HTML in C; fall back to the stdlib parser without it
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:
+    FastHTMLParser = None
+
 # Add parent directory to path for shared imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from shared.base_bot import BaseNewsBot
+from shared.rate_limit import TokenBucket
+
+# Tags strip_html turns into a line break (<p>, <br>, <br/>), and </p>, which it drops
+LINE_BREAK_TAG_PATTERN = re.compile(r"<(?:p|br)\s*/?>", re.IGNORECASE)
+CLOSING_P_TAG_PATTERN = re.compile(r"</p\s*>", re.IGNORECASE)
 
 
 class HTMLStripper(HTMLParser):
@@ -44,6 +65,22 @@ class HTMLStripper(HTMLParser):
 
 def strip_html(html: str) -> str:
     """Strip HTML tags and return plain text."""
+    # Fast path for plain text and for content made only of paragraphs and
+    # line breaks, which covers most statuses, without running a parser
+    if "<" not in html:
+        return unescape(html).strip()
+    simple = CLOSING_P_TAG_PATTERN.sub("", LINE_BREAK_TAG_PATTERN.sub("\n", html))
+    if "<" not in simple:
+        return unescape(simple).strip()
+
+    if FastHTMLParser is not None:
+        tree = FastHTMLParser(html)
+        # Same line breaks as HTMLStripper: one before every <p> and <br>
+        for node in tree.css("p, br"):
+            node.insert_before("\n")
+        body = tree.body
+        return body.text(separator="").strip() if body is not None else ""
+
     stripper = HTMLStripper()
     stripper.feed(html)
     return stripper.get_text()
@@ -52,8 +89,27 @@ def strip_html(html: str) -> str:
 class MastodonNewsBot(BaseNewsBot):
     """Bot that monitors Mastodon for relevant posts and posts to Zulip."""
 
+    # Maximum number of requests in flight at once, across all instances
+    FETCH_WORKERS = 8
+    # Sustained request rate allowed per instance (one every 2 seconds)
+    INSTANCE_REQUESTS_PER_SECOND = 0.5
+
     def __init__(self, config_path: str):
         super().__init__(config_path, bot_name="mastodon_news_bot")
+        self.http = self._create_http_session()
+        self._instance_limits_lock = threading.Lock()
+        self._instance_limits = {}
+
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session so queries reuse connections to each instance."""
+        session = requests.Session()
+        session.headers.update({
+            "Accept": "application/json",
+            "User-Agent": "MastodonNewsBot/1.0",
+        })
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self.FETCH_WORKERS)
+        session.mount("https://", adapter)
+        return session
 
     def check_all_sources(self):
         """Check all configured Mastodon sources."""
@@ -67,6 +123,62 @@ class MastodonNewsBot(BaseNewsBot):
         if sources.get("mastodon_hashtags", {}).get("enabled", False):
             self.check_mastodon_hashtags()
 
+    def _instance_limit(self, instance: str) -> TokenBucket:
+        """Return the rate limiter for an instance, creating it on first use."""
+        with self._instance_limits_lock:
+            limit = self._instance_limits.get(instance)
+            if limit is None:
+                limit = TokenBucket(rate=self.INSTANCE_REQUESTS_PER_SECOND, capacity=1)
+                self._instance_limits[instance] = limit
+            return limit
+
+    def _fetch_json(self, instance: str, url: str):
+        """Fetch a JSON API response from a Mastodon instance.
+
+        Each instance has its own token bucket, so waiting for one
+        instance's rate limit never holds up requests to the others.
+        """
+        self._instance_limit(instance).acquire()
+
+        self.logger.debug(f"Querying {instance}: {url}")
+
+        response = self.http.get(url, timeout=30)
+        response.raise_for_status()
+        return json_parser.loads(response.content)
+
+    def _fetch_statuses(self, instance: str, url: str) -> list:
+        """Fetch statuses from an instance and strip their HTML on the worker thread.
+
+        Each status that isn't a boost or already seen gets its plain text
+        stored under "_text", so the main thread is left with seen tracking,
+        categorizing and posting. The seen check here only saves work; the
+        main thread checks again before posting.
+        """
+        data = self._fetch_json(instance, url)
+        # The v2 search API wraps statuses in an object; timelines return a list
+        statuses = data.get("statuses", []) if isinstance(data, dict) else data
+
+        for status in statuses:
+            if status.get("reblog") or self.is_seen(self._post_id(instance, status)):
+                continue
+            status["_text"] = strip_html(status.get("content", ""))
+        return statuses
+
+    def _fetch_all(self, urls: dict):
+        """Fetch every (instance, term) URL concurrently.
+
+        Yields (instance, term, future) in completion order; callers call
+        future.result() inside their own error handling so failures are
+        reported against the query they belong to.
+        """
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            futures = {
+                executor.submit(self._fetch_statuses, instance, url): (instance, term)
+                for (instance, term), url in urls.items()
+            }
+            for future in as_completed(futures):
+                yield (*futures[future], future)
+
     def check_mastodon_search(self):
         """Search Mastodon instances for posts matching queries."""
         search_config = self.config["sources"]["mastodon_search"]
@@ -74,44 +186,34 @@ class MastodonNewsBot(BaseNewsBot):
         queries = search_config.get("queries", [])
         max_results = search_config.get("max_results", 20)
         max_age_hours = search_config.get("max_age_hours", 72)
-
-        for instance in instances:
-            for query in queries:
-                try:
-                    # Build API query - Mastodon v2 search API
-                    params = {
-                        "q": query,
-                        "type": "statuses",
-                        "limit": max_results
-                    }
-                    url = f"https://{instance}/api/v2/search?{urllib.parse.urlencode(params)}"
-
-                    self.logger.debug(f"Querying {instance}: {query}")
-
-                    # Make request
-                    req = urllib.request.Request(url)
-                    req.add_header("Accept", "application/json")
-                    req.add_header("User-Agent", "MastodonNewsBot/1.0")
-
-                    with urllib.request.urlopen(req, timeout=30) as response:
-                        data = json.loads(response.read().decode())
-
-                    statuses = data.get("statuses", [])
-                    self.logger.info(f"Found {len(statuses)} posts on {instance} for query: {query}")
-
-                    for status in statuses:
-                        self._process_status(status, max_age_hours, instance)
-
-                    # Rate limiting between queries
-                    time.sleep(2)
-
-                except urllib.error.HTTPError as e:
-                    self.logger.warning(f"HTTP error querying {instance} for '{query}': {e.code} {e.reason}")
-                except Exception as e:
-                    self.logger.error(f"Error querying {instance} for '{query}': {e}")
-
-            # Rate limiting between instances
-            time.sleep(3)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+
+        # Build API query URLs - Mastodon v2 search API. Each query string is
+        # encoded once and reused for every instance.
+        query_strings = {
+            query: urllib.parse.urlencode({"q": query, "type": "statuses", "limit": max_results})
+            for query in queries
+        }
+        urls = {
+            (instance, query): f"https://{instance}/api/v2/search?{query_string}"
+            for instance in instances
+            for query, query_string in query_strings.items()
+        }
+
+        # Fetch on worker threads and process each result on this thread,
+        # so seen items and posting stay single-threaded
+        for instance, query, future in self._fetch_all(urls):
+            try:
+                statuses = future.result()
+
+                self.logger.info(f"Found {len(statuses)} posts on {instance} for query: {query}")
+
+                self._process_statuses(statuses, cutoff, instance)
+
+            except requests.HTTPError as e:
+                self.logger.warning(f"HTTP error querying {instance} for '{query}': {e.response.status_code} {e.response.reason}")
+            except Exception as e:
+                self.logger.error(f"Error querying {instance} for '{query}': {e}")
 
     def check_mastodon_hashtags(self):
         """Check Mastodon instances for specific hashtags."""
@@ -120,47 +222,46 @@ class MastodonNewsBot(BaseNewsBot):
         hashtags = hashtag_config.get("hashtags", [])
         max_results = hashtag_config.get("max_results", 20)
         max_age_hours = hashtag_config.get("max_age_hours", 72)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for instance in instances:
-            for hashtag in hashtags:
-                try:
-                    # Remove # if present
-                    tag = hashtag.lstrip("#")
+        # Build hashtag timeline API URLs (removing # if present)
+        tags = [hashtag.lstrip("#") for hashtag in hashtags]
+        urls = {
+            (instance, tag): f"https://{instance}/api/v1/timelines/tag/{tag}?limit={max_results}"
+            for instance in instances
+            for tag in tags
+        }
 
-                    # Hashtag timeline API
-                    params = {"limit": max_results}
-                    url = f"https://{instance}/api/v1/timelines/tag/{tag}?{urllib.parse.urlencode(params)}"
+        for instance, tag, future in self._fetch_all(urls):
+            try:
+                statuses = future.result()
 
-                    self.logger.debug(f"Checking #{tag} on {instance}")
+                self.logger.info(f"Found {len(statuses)} posts for #{tag} on {instance}")
 
-                    req = urllib.request.Request(url)
-                    req.add_header("Accept", "application/json")
-                    req.add_header("User-Agent", "MastodonNewsBot/1.0")
+                self._process_statuses(statuses, cutoff, instance)
 
-                    with urllib.request.urlopen(req, timeout=30) as response:
-                        statuses = json.loads(response.read().decode())
+            except requests.HTTPError as e:
+                self.logger.warning(f"HTTP error checking #{tag} on {instance}: {e.response.status_code} {e.response.reason}")
+            except Exception as e:
+                self.logger.error(f"Error checking #{tag} on {instance}: {e}")
 
-                    self.logger.info(f"Found {len(statuses)} posts for #{tag} on {instance}")
+    def _post_id(self, instance: str, status: dict) -> str:
+        """Build the seen-item ID for a status."""
+        return f"mastodon_{instance}_{status.get('id', '')}"
 
-                    for status in statuses:
-                        self._process_status(status, max_age_hours, instance)
+    def _process_statuses(self, statuses: list, cutoff: datetime, instance: str):
+        """Process one response's statuses, skipping seen ones with a single batched lookup."""
+        post_ids = [self._post_id(instance, status) for status in statuses]
+        seen = self.are_seen(post_ids)
 
-                    # Rate limiting between hashtags
-                    time.sleep(2)
+        for status, post_id in zip(statuses, post_ids):
+            if post_id not in seen:
+                self._process_status(status, post_id, cutoff, instance)
 
-                except urllib.error.HTTPError as e:
-                    self.logger.warning(f"HTTP error checking #{tag} on {instance}: {e.code} {e.reason}")
-                except Exception as e:
-                    self.logger.error(f"Error checking #{tag} on {instance}: {e}")
-
-            # Rate limiting between instances
-            time.sleep(3)
-
-    def _process_status(self, status: dict, max_age_hours: int, instance: str):
-        """Process a single Mastodon status."""
+    def _process_status(self, status: dict, post_id: str, cutoff: datetime, instance: str):
+        """Process a single unseen Mastodon status."""
         try:
             # Extract status data
-            status_id = status.get("id", "")
             uri = status.get("uri", "")
             url = status.get("url", "")
             content = status.get("content", "")
@@ -171,17 +272,12 @@ class MastodonNewsBot(BaseNewsBot):
             if status.get("reblog"):
                 return
 
-            # Create unique ID
-            post_id = f"mastodon_{instance}_{status_id}"
-
-            if self.is_seen(post_id):
-                return
-
             # Check age
             if created_at:
                 try:
-                    post_date = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                    if self.is_too_old(post_date, max_age_hours):
+                    # Python 3.11+ parses the trailing "Z" itself
+                    post_date = datetime.fromisoformat(created_at)
+                    if post_date < cutoff:
                         self.mark_seen(post_id)
                         return
                     date_display = post_date.strftime('%Y-%m-%d %H:%M UTC')
@@ -198,8 +294,10 @@ class MastodonNewsBot(BaseNewsBot):
             if "@" not in author_acct:
                 author_acct = f"{author_acct}@{instance}"
 
-            # Strip HTML from content
-            text = strip_html(content)
+            # Strip HTML from content, unless the fetch worker already did
+            text = status.get("_text")
+            if text is None:
+                text = strip_html(content)
             if not text:
                 return
 
@@ -209,26 +307,27 @@ class MastodonNewsBot(BaseNewsBot):
             replies_count = status.get("replies_count", 0)
 
             # Categorize
-            category = self._categorize_item(text)
+            category = self._categorize_lowered(text.lower())
 
-            # Format message
-            msg_content = (
-                f"**Mastodon: @{author_acct}**\n"
-                f"**Author:** {author_display}\n"
-                f"**Posted:** {date_display}\n"
-                f"**URL:** {url or uri}\n"
-            )
+            # Format message as lines joined once at the end
+            lines = [
+                f"**Mastodon: @{author_acct}**",
+                f"**Author:** {author_display}",
+                f"**Posted:** {date_display}",
+                f"**URL:** {url or uri}",
+            ]
 
             if favourites_count or reblogs_count or replies_count:
-                msg_content += f"**Engagement:** {favourites_count} favorites, {reblogs_count} boosts, {replies_count} replies\n"
+                lines.append(f"**Engagement:** {favourites_count} favorites, {reblogs_count} boosts, {replies_count} replies")
 
             # Truncate long posts
             if len(text) > 500:
-                text = text[:500] + "..."
-            msg_content += f"\n{text}"
+                text = f"{text[:500]}..."
+            lines.append("")
+            lines.append(text)
+            msg_content = "\n".join(lines)
 
-            self._post_to_zulip(category, msg_content)
-            self.mark_seen(post_id)
+            self._queue_to_zulip(category, msg_content, post_id)
 
         except Exception as e:
             self.logger.error(f"Error processing Mastodon status: {e}")
@@ -7,34 +7,127 @@ Phase 1: GitHub releases, Hacker News, and Reddit monitoring.
 """
 
 import os
+import re
 import sys
 import time
-import json
 import logging
 import argparse
-import requests
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Set, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
 
+import httpx
 import yaml
 import zulip
 from dotenv import load_dotenv
+from lxml import etree
+
+# Add parent directory to path for shared imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.common import (
+    PostQueue,
+    conditional_headers,
+    load_validators,
+    make_item_id,
+    remember_validators,
+    save_validators,
+    state_dir,
+)
+from shared.rate_limit import TokenBucket
+from shared.seen_filter import BloomFilter
+
+# orjson parses response bytes directly and several times faster than the
+# stdlib json module; fall back to json without it
+try:
+    import orjson as json_parser
+except ImportError:
+    import json as json_parser
 
 # Load .env file from script directory
 load_dotenv(Path(__file__).parent / ".env")
 
+# Maximum number of feed/API requests in flight at once
+FETCH_WORKERS = 8
+
+# Maximum requests in flight to any one host, so fanning out over many repos,
+# keywords and subreddits doesn't trip a source's abuse protection
+HOST_CONCURRENCY = {
+    "api.github.com": 4,
+    "hn.algolia.com": 4,
+    "www.reddit.com": 2,
+    "news.google.com": 3,
+}
+DEFAULT_HOST_CONCURRENCY = 2
+
+# Requests per second allowed to hosts that throttle unauthenticated clients
+HOST_REQUESTS_PER_SECOND = {
+    "www.reddit.com": 1.0,
+    "news.google.com": 1.0,
+}
+
+
+def _drain_rss_items(parser):
+    """Yield each <item> the pull parser has finished, then free it."""
+    for _, item in parser.read_events():
+        yield item
+        # Clear the item and drop earlier siblings so parsed items don't
+        # accumulate under <channel> as the feed streams in
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+
+
+def _iter_rss_items(response):
+    """Yield each RSS <item> from a streamed response as soon as it is parsed.
+
+    The body is fed to lxml's pull parser chunk by chunk, so only the item
+    being read is kept in memory rather than the whole feed's tree. Malformed
+    items are tolerated, and external entities are never resolved from
+    network-fetched XML.
+    """
+    parser = etree.XMLPullParser(
+        events=("end",), tag="item", recover=True, resolve_entities=False, huge_tree=False
+    )
+    for chunk in response.iter_bytes():
+        parser.feed(chunk)
+        yield from _drain_rss_items(parser)
+    parser.close()
+    yield from _drain_rss_items(parser)
+
 
 class MCPNewsBot:
     """Bot that monitors web sources for MCP news and posts to Zulip."""
 
     def __init__(self, config_path: str):
         self.script_dir = Path(__file__).parent
+        self.state_dir = state_dir(self.script_dir)
         self.config = self._load_config(config_path)
         self._setup_logging()
         self.logger = logging.getLogger("mcp_news_bot")
         self.zulip_client = self._create_zulip_client()
+        # Zulip allows roughly 200 requests/minute per bot; stay under it
+        self.zulip_rate_limit = TokenBucket.per_minute(
+            self.config.get("zulip", {}).get("posts_per_minute", 180)
+        )
+        self.http = self._create_http_client()
+        self.executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        self._host_slots_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.host_rate_limits = {
+            host: TokenBucket(rate=rate, capacity=1)
+            for host, rate in HOST_REQUESTS_PER_SECOND.items()
+        }
         self.seen_items = self._load_seen_items()
+        self.validators_file = self.state_dir / "http_cache.json"
+        self.validators = load_validators(self.validators_file, self.logger)
+        self.post_queue = PostQueue(self._send_to_zulip, self.seen_items.add, self.logger)
+        self.category_patterns = self._build_category_patterns()
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
@@ -80,56 +173,158 @@ class MCPNewsBot:
         self.logger.info(f"Created Zulip client for {zulip_config['site']}")
         return client
 
-    def _load_seen_items(self) -> Set[str]:
-        """Load set of already-seen item IDs from disk."""
-        seen_file = self.script_dir / "seen_items.json"
-        if seen_file.exists():
+    def _create_http_client(self) -> httpx.Client:
+        """Create one pooled HTTP/2 client shared by every source.
+
+        httpx rather than requests because it handles Glama's HTTP 103 Early
+        Hints properly. Connections are kept alive across check cycles, and
+        requests to the same host are multiplexed over HTTP/2 where the
+        server supports it. Connection failures are retried twice.
+        """
+        return httpx.Client(
+            follow_redirects=True,
+            timeout=10,
+            headers={"User-Agent": "MCPNewsBot/1.0 (Zulip Integration)"},
+            transport=httpx.HTTPTransport(http2=True, retries=2),
+        )
+
+    def _fetch_concurrently(self, urls: Dict[str, str], fetch):
+        """Start fetching all URLs now and return an iterator of (key, url, future).
+
+        Each URL is passed to fetch (_fetch_feed or _fetch_json) on a worker
+        thread. Requests are submitted immediately,
+        so fetches for several sources can be started before any of them is
+        consumed. The iterator yields in completion order; callers call
+        future.result() inside their own error handling so a failed fetch is
+        reported against the repo, keyword or subreddit it belongs to.
+        """
+        futures = {
+            self.executor.submit(fetch, url): (key, url)
+            for key, url in urls.items()
+        }
+        return ((*futures[future], future) for future in as_completed(futures))
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        """Hold one of a URL's host request slots, waiting out the host's rate limit if it has one.
+
+        Slots are created on first use. The token bucket only blocks once
+        the host's allowance is used up, so there is no fixed delay between
+        requests.
+        """
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+                self._host_slots[host] = slot
+
+        with slot:
+            rate_limit = self.host_rate_limits.get(host)
+            if rate_limit is not None:
+                rate_limit.acquire()
+            yield
+
+    def _fetch_json(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Conditionally GET a URL, returning (response, data).
+
+        data is the decoded JSON body, or None for a 304 response.
+        """
+        headers = {**(headers or {}), **conditional_headers(self.validators, url)}
+        with self._host_slot(url):
+            response = self.http.get(url, headers=headers)
+        if response.status_code == 304:
+            return response, None
+        response.raise_for_status()
+        return response, json_parser.loads(response.content)
+
+    def _fetch_feed(self, url: str, timeout: float = 10):
+        """Conditionally GET an RSS feed, returning (response, items).
+
+        items is a list of (title, link, pubDate, description) tuples, or
+        None for a 304 response. Items missing a title or link are skipped,
+        and pubDate is None when an item has none. The feed is parsed as it
+        streams in, on the fetching thread.
+        """
+        items = []
+        headers = conditional_headers(self.validators, url)
+        with self._host_slot(url), self.http.stream("GET", url, headers=headers, timeout=timeout) as response:
+            if response.status_code == 304:
+                return response, None
+            response.raise_for_status()
+            for item in _iter_rss_items(response):
+                title = item.findtext("title")
+                link = item.findtext("link")
+                if title is None or link is None:
+                    continue
+                items.append((title, link, item.findtext("pubDate"), item.findtext("description") or ""))
+        return response, items
+
+    def _load_seen_items(self) -> BloomFilter:
+        """Map the filter of already-seen item IDs from disk."""
+        bloom_file = self.state_dir / "seen_items.bloom"
+        try:
+            seen = BloomFilter.open(bloom_file)
+            self.logger.info(f"Loaded {len(seen)} seen items from disk")
+        except Exception as e:
+            self.logger.warning(f"Failed to load seen items, starting a new filter: {e}")
+            seen = BloomFilter.create(bloom_file)
+
+        # Migrate IDs from the old JSON list format into a new filter. The file
+        # is read from the state directory, so under Docker Compose it has to
+        # be copied into state/ once; without BOT_STATE_DIR that is the bot's
+        # own directory, where it always lived
+        legacy_file = self.state_dir / "seen_items.json"
+        if len(seen) == 0 and legacy_file.is_file():
             try:
-                with open(seen_file, "r") as f:
-                    data = json.load(f)
-                    seen = set(data.get("items", []))
-                    self.logger.info(f"Loaded {len(seen)} seen items from disk")
-                    return seen
+                with open(legacy_file, "rb") as f:
+                    for item_id in json_parser.loads(f.read()).get("items", []):
+                        seen.add(item_id)
+                self.logger.info(f"Migrated {len(seen)} seen items from {legacy_file.name}")
             except Exception as e:
-                self.logger.warning(f"Failed to load seen items: {e}")
-        return set()
+                self.logger.warning(f"Failed to migrate seen items: {e}")
+
+        return seen
 
     def _save_seen_items(self):
-        """Save seen item IDs to disk."""
-        seen_file = self.script_dir / "seen_items.json"
+        """Write the seen-items filter's changed pages back to disk."""
         try:
-            # Keep only the most recent 2000 items to prevent unbounded growth
-            items_to_save = list(self.seen_items)[-2000:]
-            with open(seen_file, "w") as f:
-                json.dump({"items": items_to_save, "last_updated": datetime.now(timezone.utc).isoformat()}, f, indent=2)
-            self.logger.debug(f"Saved {len(items_to_save)} seen items to disk")
+            self.seen_items.flush()
+            self.logger.debug(f"Saved {len(self.seen_items)} seen items to disk")
         except Exception as e:
             self.logger.error(f"Failed to save seen items: {e}")
 
-    def _matches_keywords(self, text: str, keywords: List[str]) -> bool:
-        """Check if text matches any of the keywords (case-insensitive)."""
+    def _build_category_patterns(self) -> Dict[str, re.Pattern]:
+        """Compile one case-insensitive alternation per category, preserving config order."""
+        categories = self.config.get("categories", {})
+        return {
+            category_name: re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+            for category_name, category_data in categories.items()
+            for keywords in [category_data.get("keywords", [])]
+            if keywords
+        }
+
+    def _matches_keywords(self, text: str, keywords: tuple) -> bool:
+        """Check if text matches any of the already-lowercased keywords (case-insensitive)."""
         if not text:
             return False
         text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in keywords)
+        return any(keyword in text_lower for keyword in keywords)
 
     def _categorize_item(self, title: str, body: str = "") -> str:
         """Determine category based on keywords in title/body."""
-        combined = f"{title} {body}".lower()
-
-        categories = self.config.get("categories", {})
+        combined = f"{title} {body}"
 
-        # Check each category's keywords
-        for category_name, category_data in categories.items():
-            keywords = category_data.get("keywords", [])
-            if self._matches_keywords(combined, keywords):
+        # Check each category's keywords with a single scan per category
+        for category_name, pattern in self.category_patterns.items():
+            if pattern.search(combined):
                 return category_name
 
         # Default category
         return self.config.get("default_category", "General")
 
-    def _post_to_zulip(self, category: str, content: str):
-        """Post news item to Zulip."""
+    def _queue_to_zulip(self, category: str, content: str, item_id: str):
+        """Queue a news item to be posted with the rest of its topic, marking it seen once posted."""
         zulip_config = self.config.get("zulip", {})
         stream = zulip_config.get("stream", "mcp-news")
 
@@ -137,6 +332,11 @@ class MCPNewsBot:
         categories = self.config.get("categories", {})
         topic = categories.get(category, {}).get("topic", category)
 
+        self.post_queue.add(stream, topic, content, item_id)
+
+    def _send_to_zulip(self, stream: str, topic: str, content: str) -> bool:
+        """Send a single message to a Zulip stream/topic, returning whether it was posted."""
+        self.zulip_rate_limit.acquire()
         result = self.zulip_client.send_message({
             "type": "stream",
             "to": stream,
@@ -146,122 +346,162 @@ class MCPNewsBot:
 
         if result.get("result") != "success":
             self.logger.error(f"Failed to send to Zulip: {result}")
-        else:
-            self.logger.info(f"Posted to #{stream} > {topic}")
-
-    def check_glama_rss(self):
-        """Check Glama.ai blog RSS feed for MCP news."""
+            return False
+        self.logger.info(f"Posted to #{stream} > {topic}")
+        return True
+
+    def _glama_urls(self) -> Dict[str, str]:
+        """Return {"glama": RSS URL} for the Glama.ai source, if enabled."""
+        glama_config = self.config.get("sources", {}).get("glama", {})
+        if not glama_config.get("enabled", False):
+            return {}
+        return {"glama": glama_config.get("rss_url", "https://glama.ai/blog/rss.xml")}
+
+    def _github_urls(self) -> Dict[str, str]:
+        """Return {repo: releases API URL} for the GitHub source, if enabled."""
+        github_config = self.config.get("sources", {}).get("github", {})
+        if not github_config.get("enabled", False):
+            return {}
+        return {
+            repo: f"https://api.github.com/repos/{repo}/releases"
+            for repo in github_config.get("repos", [])
+        }
+
+    def _github_headers(self) -> Dict[str, str]:
+        """Build GitHub API request headers, authenticated if a token is set."""
+        headers = {"Accept": "application/vnd.github.v3+json"}
+
+        # Add GitHub token if available
+        github_token = os.environ.get("GITHUB_TOKEN")
+        if github_token:
+            headers["Authorization"] = f"token {github_token}"
+
+        return headers
+
+    def _hackernews_urls(self) -> Dict[str, str]:
+        """Return {keyword: Algolia search URL} for the Hacker News source, if enabled."""
+        hn_config = self.config.get("sources", {}).get("hackernews", {})
+        if not hn_config.get("enabled", False):
+            return {}
+
+        # Use Algolia HN Search API
+        base_url = "https://hn.algolia.com/api/v1/search"
+        urls = {}
+        for keyword in hn_config.get("keywords", []):
+            params = {
+                "query": keyword,
+                "tags": "story",
+                "hitsPerPage": 10,
+            }
+            urls[keyword] = f"{base_url}?{urllib.parse.urlencode(params)}"
+        return urls
+
+    def _reddit_urls(self) -> Dict[str, str]:
+        """Return {subreddit: new-posts JSON URL} for the Reddit source, if enabled."""
+        reddit_config = self.config.get("sources", {}).get("reddit", {})
+        if not reddit_config.get("enabled", False):
+            return {}
+
+        # Use Reddit JSON API (no auth required for public posts)
+        return {
+            subreddit: f"https://www.reddit.com/r/{subreddit}/new.json"
+            for subreddit in reddit_config.get("subreddits", [])
+        }
+
+    def _google_news_urls(self) -> Dict[str, str]:
+        """Return {keyword: Google News RSS URL} for the Google News source, if enabled."""
+        google_config = self.config.get("sources", {}).get("google_news", {})
+        if not google_config.get("enabled", False):
+            return {}
+
+        # Google News RSS feed for each search term (URL-encoded)
+        return {
+            keyword: f"https://news.google.com/rss/search?q={urllib.parse.quote(keyword)}&hl=en-US&gl=US&ceid=US:en"
+            for keyword in google_config.get("keywords", [])
+        }
+
+    def check_glama_rss(self, fetches):
+        """Process the fetched Glama.ai blog RSS feed for MCP news."""
         if not self.config.get("sources", {}).get("glama", {}).get("enabled", False):
             return
 
         glama_config = self.config["sources"]["glama"]
-        rss_url = glama_config.get("rss_url", "https://glama.ai/blog/rss.xml")
+        max_age_hours = glama_config.get("max_age_hours", 168)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        try:
-            # Use httpx instead of requests - handles HTTP 103 Early Hints properly
-            import httpx
-            headers = {"User-Agent": "MCPNewsBot/1.0 (Zulip Integration)"}
-            with httpx.Client(http2=True, follow_redirects=True) as client:
-                response = client.get(rss_url, headers=headers, timeout=30)
-                response.raise_for_status()
-
-            # Parse RSS feed
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.content)
-
-            for item in root.findall(".//item"):
-                title_elem = item.find("title")
-                link_elem = item.find("link")
-                pub_date_elem = item.find("pubDate")
-                description_elem = item.find("description")
-
-                if title_elem is None or link_elem is None:
+        for _, url, future in fetches:
+            try:
+                response, items = future.result()
+                if response.status_code == 304:
+                    self.logger.debug("Glama RSS feed unchanged")
                     continue
 
-                title = title_elem.text
-                link = link_elem.text
+                for title, link, pub_date_str, description in items:
+                    # Create unique ID
+                    item_id = make_item_id("glama_blog", link)
 
-                # Create unique ID
-                item_id = f"glama_blog_{hash(link)}"
+                    if item_id in self.seen_items or item_id in self.post_queue:
+                        continue
 
-                if item_id in self.seen_items:
-                    continue
+                    # Parse publication date
+                    if pub_date_str is not None:
+                        try:
+                            pub_date = parsedate_to_datetime(pub_date_str)
 
-                # Parse publication date
-                if pub_date_elem is not None:
-                    pub_date_str = pub_date_elem.text
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        pub_date = parsedate_to_datetime(pub_date_str)
-                        hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
-
-                        max_age_hours = glama_config.get("max_age_hours", 168)
-                        if hours_old > max_age_hours:
-                            self.seen_items.add(item_id)
-                            continue
-
-                        date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse Glama date: {e}")
+                            if pub_date < cutoff:
+                                self.seen_items.add(item_id)
+                                continue
+
+                            date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
+                        except Exception as e:
+                            self.logger.warning(f"Failed to parse Glama date: {e}")
+                            date_str = "Unknown"
+                    else:
                         date_str = "Unknown"
-                else:
-                    date_str = "Unknown"
 
-                # Categorize based on title
-                category = self._categorize_item(title, description_elem.text if description_elem is not None else "")
+                    # Categorize based on title
+                    category = self._categorize_item(title, description)
 
-                content = (
-                    f"**Glama.ai Blog: {title}**\n"
-                    f"**Published:** {date_str}\n"
-                    f"**URL:** {link}"
-                )
+                    content = (
+                        f"**Glama.ai Blog: {title}**\n"
+                        f"**Published:** {date_str}\n"
+                        f"**URL:** {link}"
+                    )
 
-                self._post_to_zulip(category, content)
-                self.seen_items.add(item_id)
+                    self._queue_to_zulip(category, content, item_id)
 
-                # Rate limiting
-                time.sleep(2)
+                remember_validators(self.validators, url, response.headers)
 
-        except Exception as e:
-            self.logger.error(f"Error checking Glama RSS: {e}")
+            except Exception as e:
+                self.logger.error(f"Error checking Glama RSS: {e}")
 
-    def check_github_releases(self):
-        """Check GitHub for new releases related to MCP."""
+    def check_github_releases(self, fetches):
+        """Process fetched GitHub releases related to MCP."""
         if not self.config.get("sources", {}).get("github", {}).get("enabled", False):
             return
 
         github_config = self.config["sources"]["github"]
-        repos = github_config.get("repos", [])
+        max_age_hours = github_config.get("max_age_hours", 168)  # Default 1 week
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for repo in repos:
+        for repo, url, future in fetches:
             try:
-                # Use GitHub API to check releases
-                url = f"https://api.github.com/repos/{repo}/releases"
-                headers = {"Accept": "application/vnd.github.v3+json"}
-
-                # Add GitHub token if available
-                github_token = os.environ.get("GITHUB_TOKEN")
-                if github_token:
-                    headers["Authorization"] = f"token {github_token}"
-
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-
-                releases = response.json()
+                response, releases = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"GitHub releases unchanged for {repo}")
+                    continue
 
                 # Check most recent releases
                 for release in releases[:5]:  # Only check last 5 releases
                     release_id = f"github_release_{repo}_{release['id']}"
 
-                    if release_id in self.seen_items:
+                    if release_id in self.seen_items or release_id in self.post_queue:
                         continue
 
                     # Check if release is recent (within configured timeframe)
-                    published_at = datetime.strptime(release["published_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                    hours_old = (datetime.now(timezone.utc) - published_at).total_seconds() / 3600
+                    published_at = datetime.fromisoformat(release["published_at"].replace("Z", "+00:00"))
 
-                    max_age_hours = github_config.get("max_age_hours", 168)  # Default 1 week
-                    if hours_old > max_age_hours:
+                    if published_at < cutoff:
                         self.seen_items.add(release_id)
                         continue
 
@@ -282,60 +522,39 @@ class MCPNewsBot:
                             notes += "..."
                         content += f"**Release Notes:**\n{notes}"
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(release_id)
+                    self._queue_to_zulip(category, content, release_id)
 
-                    # Rate limiting
-                    time.sleep(2)
-
-                # Small delay between repos
-                time.sleep(1)
+                remember_validators(self.validators, url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking GitHub releases for {repo}: {e}")
 
-    def check_hackernews(self):
-        """Check Hacker News for stories matching keywords."""
+    def check_hackernews(self, fetches):
+        """Process fetched Hacker News searches for stories matching keywords."""
         if not self.config.get("sources", {}).get("hackernews", {}).get("enabled", False):
             return
 
         hn_config = self.config["sources"]["hackernews"]
-        keywords = hn_config.get("keywords", [])
-
-        try:
-            # Use Algolia HN Search API
-            base_url = "https://hn.algolia.com/api/v1/search"
-
-            for keyword in keywords:
-                params = {
-                    "query": keyword,
-                    "tags": "story",
-                    "hitsPerPage": 10,
-                }
+        max_age_hours = hn_config.get("max_age_hours", 48)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-                response = requests.get(base_url, params=params, timeout=10)
-                response.raise_for_status()
-
-                data = response.json()
+        for keyword, search_url, future in fetches:
+            try:
+                response, data = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"Hacker News results unchanged for '{keyword}'")
+                    continue
 
                 for hit in data.get("hits", []):
                     story_id = f"hn_story_{hit['objectID']}"
 
-                    if story_id in self.seen_items:
+                    if story_id in self.seen_items or story_id in self.post_queue:
                         continue
 
-                    # Check age - handle both date formats (with and without milliseconds)
-                    created_at_str = hit["created_at"]
-                    try:
-                        # Try with milliseconds first
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        # Fall back to format without milliseconds
-                        created_at = datetime.strptime(created_at_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                    hours_old = (datetime.now(timezone.utc) - created_at).total_seconds() / 3600
-
-                    max_age_hours = hn_config.get("max_age_hours", 48)
-                    if hours_old > max_age_hours:
+                    # Check age - created_at is ISO 8601 with or without milliseconds
+                    created_at = datetime.fromisoformat(hit["created_at"].replace("Z", "+00:00"))
+
+                    if created_at < cutoff:
                         self.seen_items.add(story_id)
                         continue
 
@@ -355,43 +574,36 @@ class MCPNewsBot:
                         f"**HN Discussion:** https://news.ycombinator.com/item?id={hit['objectID']}"
                     )
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(story_id)
+                    self._queue_to_zulip(category, content, story_id)
 
-                    # Rate limiting
-                    time.sleep(2)
+                remember_validators(self.validators, search_url, response.headers)
 
-                # Delay between keyword searches
-                time.sleep(1)
-
-        except Exception as e:
-            self.logger.error(f"Error checking Hacker News: {e}")
+            except Exception as e:
+                self.logger.error(f"Error checking Hacker News for '{keyword}': {e}")
 
-    def check_reddit(self):
-        """Check Reddit for posts matching keywords."""
+    def check_reddit(self, fetches):
+        """Process fetched Reddit listings for posts matching keywords."""
         if not self.config.get("sources", {}).get("reddit", {}).get("enabled", False):
             return
 
         reddit_config = self.config["sources"]["reddit"]
-        subreddits = reddit_config.get("subreddits", [])
-        keywords = reddit_config.get("keywords", [])
+        # Lowercase the filter keywords once rather than for every post
+        keywords = tuple(k.lower() for k in reddit_config.get("keywords", []))
+        max_age_hours = reddit_config.get("max_age_hours", 48)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for subreddit in subreddits:
+        for subreddit, url, future in fetches:
             try:
-                # Use Reddit JSON API (no auth required for public posts)
-                url = f"https://www.reddit.com/r/{subreddit}/new.json"
-                headers = {"User-Agent": "MCPNewsBot/1.0"}
-
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-
-                data = response.json()
+                response, data = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"Reddit r/{subreddit} unchanged")
+                    continue
 
                 for post in data["data"]["children"]:
                     post_data = post["data"]
                     post_id = f"reddit_post_{post_data['id']}"
 
-                    if post_id in self.seen_items:
+                    if post_id in self.seen_items or post_id in self.post_queue:
                         continue
 
                     # Check if post matches keywords
@@ -404,10 +616,8 @@ class MCPNewsBot:
 
                     # Check age
                     created_utc = datetime.fromtimestamp(post_data["created_utc"], tz=timezone.utc)
-                    hours_old = (datetime.now(timezone.utc) - created_utc).total_seconds() / 3600
 
-                    max_age_hours = reddit_config.get("max_age_hours", 48)
-                    if hours_old > max_age_hours:
+                    if created_utc < cutoff:
                         self.seen_items.add(post_id)
                         continue
 
@@ -432,70 +642,44 @@ class MCPNewsBot:
                             preview += "..."
                         content += f"\n**Preview:**\n{preview}"
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(post_id)
+                    self._queue_to_zulip(category, content, post_id)
 
-                    # Rate limiting
-                    time.sleep(2)
-
-                # Delay between subreddits
-                time.sleep(3)
+                remember_validators(self.validators, url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking Reddit r/{subreddit}: {e}")
 
-    def check_google_news(self):
-        """Check Google News RSS feed for configured search terms."""
+    def check_google_news(self, fetches):
+        """Process fetched Google News RSS results for configured search terms."""
         if not self.config.get("sources", {}).get("google_news", {}).get("enabled", False):
             return
 
         google_config = self.config["sources"]["google_news"]
-        keywords = google_config.get("keywords", [])
+        max_age_hours = google_config.get("max_age_hours", 168)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
 
-        for keyword in keywords:
+        for keyword, search_url, future in fetches:
             try:
-                # Google News RSS feed for search term
-                # URL encode the keyword for the query
-                import urllib.parse
-                encoded_keyword = urllib.parse.quote(keyword)
-                url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=en-US&gl=US&ceid=US:en"
-
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-
-                # Parse RSS feed (simple XML parsing)
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
+                response, items = future.result()
+                if response.status_code == 304:
+                    self.logger.debug(f"Google News results unchanged for '{keyword}'")
+                    continue
 
                 # Google News RSS uses standard RSS 2.0 format
-                for item in root.findall(".//item"):
-                    title_elem = item.find("title")
-                    link_elem = item.find("link")
-                    pub_date_elem = item.find("pubDate")
-
-                    if title_elem is None or link_elem is None:
-                        continue
-
-                    title = title_elem.text
-                    link = link_elem.text
-
+                for title, link, pub_date_str, _ in items:
                     # Create unique ID
-                    news_id = f"google_news_{hash(link)}"
+                    news_id = make_item_id("google_news", link)
 
-                    if news_id in self.seen_items:
+                    if news_id in self.seen_items or news_id in self.post_queue:
                         continue
 
                     # Parse publication date
-                    if pub_date_elem is not None:
-                        pub_date_str = pub_date_elem.text
+                    if pub_date_str is not None:
                         try:
                             # RFC 2822 format: "Wed, 02 Oct 2002 13:00:00 GMT"
-                            from email.utils import parsedate_to_datetime
                             pub_date = parsedate_to_datetime(pub_date_str)
-                            hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
 
-                            max_age_hours = google_config.get("max_age_hours", 168)
-                            if hours_old > max_age_hours:
+                            if pub_date < cutoff:
                                 self.seen_items.add(news_id)
                                 continue
 
@@ -516,14 +700,9 @@ class MCPNewsBot:
                         f"**URL:** {link}"
                     )
 
-                    self._post_to_zulip(category, content)
-                    self.seen_items.add(news_id)
+                    self._queue_to_zulip(category, content, news_id)
 
-                    # Rate limiting
-                    time.sleep(2)
-
-                # Delay between keyword searches
-                time.sleep(1)
+                remember_validators(self.validators, search_url, response.headers)
 
             except Exception as e:
                 self.logger.error(f"Error checking Google News for '{keyword}': {e}")
@@ -533,14 +712,32 @@ class MCPNewsBot:
         self.logger.info("Checking all sources for new MCP news...")
 
         try:
-            self.check_glama_rss()
-            self.check_github_releases()
-            self.check_hackernews()
-            self.check_reddit()
-            self.check_google_news()
-
-            # Save seen items after each check cycle
+            # Start every source's requests up front so the cycle's network
+            # time is roughly that of the slowest source, not the sum of all
+            glama_fetches = self._fetch_concurrently(self._glama_urls(), partial(self._fetch_feed, timeout=30))
+            github_fetches = self._fetch_concurrently(
+                self._github_urls(), partial(self._fetch_json, headers=self._github_headers())
+            )
+            hn_fetches = self._fetch_concurrently(self._hackernews_urls(), self._fetch_json)
+            reddit_fetches = self._fetch_concurrently(self._reddit_urls(), self._fetch_json)
+            google_fetches = self._fetch_concurrently(self._google_news_urls(), self._fetch_feed)
+
+            self.check_glama_rss(glama_fetches)
+            self.check_github_releases(github_fetches)
+            self.check_hackernews(hn_fetches)
+            self.check_reddit(reddit_fetches)
+            self.check_google_news(google_fetches)
+
+            # Post everything found this cycle, batched per topic; items are
+            # only marked seen once posted, and failed posts stay queued
+            posted = self.post_queue.flush()
+
+            # Save seen items and HTTP validators after each check cycle. While
+            # posts are still queued, keep the validators saved before them so a
+            # restart refetches their sources instead of getting 304s
             self._save_seen_items()
+            if posted:
+                save_validators(self.validators_file, self.validators, self.logger)
 
         except Exception as e:
             self.logger.error(f"Error during source check: {e}")
@@ -588,12 +785,15 @@ def main():
 
     bot = MCPNewsBot(str(config_path))
 
-    if args.check_once:
-        bot.check_all_sources()
-        print("Single check completed!")
-        sys.exit(0)
+    try:
+        if args.check_once:
+            bot.check_all_sources()
+            print("Single check completed!")
+            sys.exit(0)
 
-    bot.run()
+        bot.run()
+    finally:
+        bot.http.close()
 
 
 if __name__ == "__main__":
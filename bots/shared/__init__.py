@@ -6,5 +6,7 @@ bots that post to Zulip.
 """
 
 from .base_bot import BaseNewsBot
+from .rate_limit import TokenBucket
+from .seen_filter import BloomFilter
 
-__all__ = ["BaseNewsBot"]
+__all__ = ["BaseNewsBot", "BloomFilter", "TokenBucket"]
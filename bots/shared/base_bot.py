@@ -7,11 +7,13 @@ Provides common functionality for:
 - Logging setup
 - Zulip client creation
 - Seen items tracking (deduplication)
+- HTTP conditional GET validators (ETag / Last-Modified)
 - Keyword matching and categorization
-- Posting to Zulip
+- Posting to Zulip, batched per topic
 """
 
 import os
+import re
 import json
 import logging
 import time
@@ -24,10 +26,25 @@ import yaml
 import zulip
 from dotenv import load_dotenv
 
+from .common import (
+    PostQueue,
+    conditional_headers,
+    load_validators,
+    make_item_id,
+    remember_validators,
+    save_validators,
+    state_dir,
+)
+from .rate_limit import TokenBucket
+from .seen_filter import BloomFilter
+
 
 class BaseNewsBot(ABC):
     """Base class for news aggregator bots."""
 
+    # Number of most recent seen item IDs kept across compactions
+    SEEN_ITEMS_LIMIT = 2000
+
     def __init__(self, config_path: str, bot_name: str = "news_bot"):
         """
         Initialize the bot.
@@ -38,6 +55,7 @@ class BaseNewsBot(ABC):
         """
         self.bot_name = bot_name
         self.script_dir = Path(config_path).parent
+        self.state_dir = state_dir(self.script_dir)
 
         # Load .env from script directory
         load_dotenv(self.script_dir / ".env")
@@ -46,7 +64,29 @@ class BaseNewsBot(ABC):
         self._setup_logging()
         self.logger = logging.getLogger(bot_name)
         self.zulip_client = self._create_zulip_client()
-        self.seen_items = self._load_seen_items()
+        # Zulip allows roughly 200 requests/minute per bot; stay under it
+        self.zulip_rate_limit = TokenBucket.per_minute(
+            self.config.get("zulip", {}).get("posts_per_minute", 180)
+        )
+        seen_filter = self.config.get("seen_filter")
+        if seen_filter:
+            self.seen_items = self._open_seen_filter(self.state_dir / seen_filter)
+            self._seen_log = None
+        else:
+            self.seen_items = self._load_seen_items()
+            self._seen_log = open(self.state_dir / "seen_items.log", "a")
+            self._seen_log_lines = len(self.seen_items)
+        self.validators_file = self.state_dir / "http_cache.json"
+        self.validators = load_validators(self.validators_file, self.logger)
+        self.category_patterns = self._build_category_patterns()
+        # Per-item lookups resolved once from config
+        self.default_category = self.config.get("default_category", "General")
+        self.zulip_stream = self.config.get("zulip", {}).get("stream", "news")
+        self.category_topics = {
+            category_name: category_data.get("topic", category_name)
+            for category_name, category_data in self.config.get("categories", {}).items()
+        }
+        self.post_queue = PostQueue(self._send_to_zulip, self.mark_seen, self.logger)
 
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file with env var expansion."""
@@ -109,35 +149,81 @@ class BaseNewsBot(ABC):
         self.logger.info(f"Created Zulip client for {zulip_config['site']}")
         return client
 
-    def _load_seen_items(self) -> Set[str]:
-        """Load set of already-seen item IDs from disk."""
-        seen_file = self.script_dir / "seen_items.json"
-        if seen_file.exists():
-            try:
-                with open(seen_file, "r") as f:
-                    data = json.load(f)
-                    seen = set(data.get("items", []))
-                    self.logger.info(f"Loaded {len(seen)} seen items from disk")
-                    return seen
-            except Exception as e:
-                self.logger.warning(f"Failed to load seen items: {e}")
-        return set()
+    def _load_seen_items(self) -> Dict[str, None]:
+        """Load already-seen item IDs from disk, oldest first.
+
+        IDs are kept as dict keys so insertion order records recency for
+        compaction. A legacy seen_items.json in the state directory is
+        migrated on first load; under Docker Compose it has to be copied
+        into state/ once, as it is no longer mounted.
+        """
+        log_file = self.state_dir / "seen_items.log"
+        legacy_file = self.state_dir / "seen_items.json"
+        try:
+            if log_file.exists() and log_file.stat().st_size > 0:
+                with open(log_file, "r") as f:
+                    seen = dict.fromkeys(line.strip() for line in f if line.strip())
+                self.logger.info(f"Loaded {len(seen)} seen items from disk")
+                return seen
+            if legacy_file.is_file():
+                with open(legacy_file, "r") as f:
+                    seen = dict.fromkeys(json.load(f).get("items", []))
+                with open(log_file, "w") as f:
+                    f.writelines(f"{item_id}\n" for item_id in seen)
+                self.logger.info(f"Migrated {len(seen)} seen items from {legacy_file.name}")
+                return seen
+        except Exception as e:
+            self.logger.warning(f"Failed to load seen items: {e}")
+        return {}
+
+    def _open_seen_filter(self, path: Path) -> BloomFilter:
+        """Map the Bloom filter configured as seen_filter, seeding it with any local seen items."""
+        try:
+            seen = BloomFilter.open(path)
+        except Exception as e:
+            self.logger.warning(f"Failed to load seen items filter, starting a new one: {e}")
+            seen = BloomFilter.create(path)
+
+        # Carry over IDs from this bot's own log; re-adding them is a no-op
+        for item_id in self._load_seen_items():
+            seen.add(item_id)
+        self.logger.info(f"Using seen items filter {path.name} ({len(seen)} items)")
+        return seen
 
     def _save_seen_items(self):
-        """Save seen item IDs to disk."""
-        seen_file = self.script_dir / "seen_items.json"
+        """Flush newly seen item IDs to the append-only log.
+
+        Each cycle only writes the IDs added since the last one. Once the log
+        grows past twice SEEN_ITEMS_LIMIT it is rewritten with the most recent
+        IDs, which also bounds the in-memory set. With a seen_filter
+        configured, the filter's changed pages are flushed instead.
+        """
         try:
-            # Keep only the most recent 2000 items to prevent unbounded growth
-            items_to_save = list(self.seen_items)[-2000:]
-            with open(seen_file, "w") as f:
-                json.dump({
-                    "items": items_to_save,
-                    "last_updated": datetime.now(timezone.utc).isoformat()
-                }, f, indent=2)
-            self.logger.debug(f"Saved {len(items_to_save)} seen items to disk")
+            if self._seen_log is None:
+                self.seen_items.flush()
+                return
+            if self._seen_log_lines > 2 * self.SEEN_ITEMS_LIMIT:
+                recent = list(self.seen_items)[-self.SEEN_ITEMS_LIMIT:]
+                self.seen_items = dict.fromkeys(recent)
+                # Truncate in place rather than replacing the file so a
+                # single-file Docker volume mount keeps pointing at it
+                self._seen_log.close()
+                self._seen_log = open(self.state_dir / "seen_items.log", "w")
+                self._seen_log.writelines(f"{item_id}\n" for item_id in recent)
+                self._seen_log_lines = len(recent)
+                self.logger.debug(f"Compacted seen items log to {len(recent)} entries")
+            self._seen_log.flush()
         except Exception as e:
             self.logger.error(f"Failed to save seen items: {e}")
 
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a previously fetched URL."""
+        return conditional_headers(self.validators, url)
+
+    def remember_validators(self, url: str, headers):
+        """Store a response's validators once its content has been fully processed."""
+        remember_validators(self.validators, url, headers)
+
     def _matches_keywords(self, text: str, keywords: List[str]) -> bool:
         """Check if text matches any of the keywords (case-insensitive)."""
         if not text or not keywords:
@@ -145,30 +231,47 @@ class BaseNewsBot(ABC):
         text_lower = text.lower()
         return any(keyword.lower() in text_lower for keyword in keywords)
 
+    def _build_category_patterns(self) -> Dict[str, re.Pattern]:
+        """Compile one alternation of lowercased keywords per category, preserving config order."""
+        categories = self.config.get("categories", {})
+        return {
+            category_name: re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+            for category_name, category_data in categories.items()
+            for keywords in [category_data.get("keywords", [])]
+            if keywords
+        }
+
     def _categorize_item(self, title: str, body: str = "") -> str:
         """Determine category based on keywords in title/body."""
-        combined = f"{title} {body}".lower()
+        return self._categorize_lowered(f"{title} {body}".lower())
 
-        categories = self.config.get("categories", {})
-
-        # Check each category's keywords
-        for category_name, category_data in categories.items():
-            keywords = category_data.get("keywords", [])
-            if keywords and self._matches_keywords(combined, keywords):
+    def _categorize_lowered(self, text_lower: str) -> str:
+        """Determine category for text the caller has already lowercased."""
+        # Check each category's keywords with a single scan per category
+        for category_name, pattern in self.category_patterns.items():
+            if pattern.search(text_lower):
                 return category_name
 
         # Default category
-        return self.config.get("default_category", "General")
+        return self.default_category
 
-    def _post_to_zulip(self, category: str, content: str):
-        """Post news item to Zulip."""
-        zulip_config = self.config.get("zulip", {})
-        stream = zulip_config.get("stream", "news")
+    def _queue_to_zulip(self, category: str, content: str, item_id: Optional[str] = None):
+        """Queue a news item to be posted with the rest of its topic.
 
+        item_id is marked seen once the message carrying it is posted.
+        """
         # Get topic from category configuration
-        categories = self.config.get("categories", {})
-        topic = categories.get(category, {}).get("topic", category)
+        topic = self.category_topics.get(category, category)
+
+        self.post_queue.add(self.zulip_stream, topic, content, item_id)
+
+    def _flush_zulip(self) -> bool:
+        """Post all queued items, one message per stream/topic, returning True if all were posted."""
+        return self.post_queue.flush()
 
+    def _send_to_zulip(self, stream: str, topic: str, content: str) -> bool:
+        """Send a single message to a Zulip stream/topic, returning whether it was posted."""
+        self.zulip_rate_limit.acquire()
         result = self.zulip_client.send_message({
             "type": "stream",
             "to": stream,
@@ -178,8 +281,9 @@ class BaseNewsBot(ABC):
 
         if result.get("result") != "success":
             self.logger.error(f"Failed to send to Zulip: {result}")
-        else:
-            self.logger.info(f"Posted to #{stream} > {topic}")
+            return False
+        self.logger.info(f"Posted to #{stream} > {topic}")
+        return True
 
     def is_too_old(self, timestamp: datetime, max_age_hours: int) -> bool:
         """Check if a timestamp is older than the max age."""
@@ -188,13 +292,44 @@ class BaseNewsBot(ABC):
         hours_old = (datetime.now(timezone.utc) - timestamp).total_seconds() / 3600
         return hours_old > max_age_hours
 
+    def make_item_id(self, prefix: str, value: str) -> str:
+        """Build a seen-item ID from a URL or other key, stable across restarts.
+
+        Unlike the builtin hash(), which is salted per process, the digest is
+        the same every run, so persisted seen items keep matching.
+        """
+        return make_item_id(prefix, value)
+
     def mark_seen(self, item_id: str):
-        """Mark an item as seen."""
-        self.seen_items.add(item_id)
+        """Mark an item as seen, appending it to the seen items log if new."""
+        if item_id in self.seen_items:
+            return
+        if self._seen_log is None:
+            self.seen_items.add(item_id)
+        else:
+            self.seen_items[item_id] = None
+            self._seen_log.write(f"{item_id}\n")
+            self._seen_log_lines += 1
 
     def is_seen(self, item_id: str) -> bool:
-        """Check if an item has been seen."""
-        return item_id in self.seen_items
+        """Check if an item has been seen or is already queued to post."""
+        return item_id in self.seen_items or item_id in self.post_queue
+
+    def are_seen(self, item_ids: List[str]) -> Set[str]:
+        """Return which of a batch of item IDs have been seen or are already queued to post."""
+        seen_items = self.seen_items
+        post_queue = self.post_queue
+        return {item_id for item_id in item_ids if item_id in seen_items or item_id in post_queue}
+
+    def _flush_and_save(self):
+        """Post queued items, then persist seen items and HTTP validators."""
+        posted = self._flush_zulip()
+        self._save_seen_items()
+        # While posts are still queued, keep the validators saved before them:
+        # after a restart their sources must be refetched, not answered with
+        # 304 Not Modified, or the unposted items would never be queued again
+        if posted:
+            save_validators(self.validators_file, self.validators, self.logger)
 
     @abstractmethod
     def check_all_sources(self):
@@ -212,19 +347,30 @@ class BaseNewsBot(ABC):
             if isinstance(source_config, dict) and source_config.get("enabled", False):
                 self.logger.info(f"Monitoring source: {source_name}")
 
+        # Schedule cycles against a monotonic deadline so the time spent
+        # checking sources counts toward the interval instead of adding to it
+        deadline = time.monotonic()
         while True:
+            deadline += poll_interval
             try:
                 self.check_all_sources()
-                self._save_seen_items()
             except Exception as e:
                 self.logger.error(f"Error during source check: {e}")
 
-            self.logger.info(f"Sleeping for {poll_interval} seconds...")
-            time.sleep(poll_interval)
+            # Post everything found this cycle in batched messages, even if a
+            # source failed part way
+            self._flush_and_save()
+
+            delay = max(0.0, deadline - time.monotonic())
+            if delay == 0.0:
+                # Cycle overran the interval; start the next one now
+                deadline = time.monotonic()
+            self.logger.info(f"Sleeping for {delay:.0f} seconds...")
+            time.sleep(delay)
 
     def run_once(self):
         """Check sources once and exit (for testing)."""
         self.logger.info(f"Running single check for {self.bot_name}...")
         self.check_all_sources()
-        self._save_seen_items()
+        self._flush_and_save()
         self.logger.info("Single check completed!")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by all news bots, including those that don't subclass BaseNewsBot.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# Zulip rejects messages longer than this many characters
+ZULIP_MAX_MESSAGE_LENGTH = 10000
+
+# Separator between news items batched into one Zulip message
+ITEM_SEPARATOR = "\n\n---\n\n"
+
+
+def state_dir(script_dir: Path) -> Path:
+    """Return the directory a bot keeps its state files in, creating it if needed.
+
+    Defaults to the bot's own directory. Docker Compose sets BOT_STATE_DIR
+    to a mounted directory instead of mounting each state file: Docker
+    creates a missing host directory for a directory mount, but also turns
+    a missing host file into a directory, which the bot can't open.
+    """
+    path = Path(os.environ.get("BOT_STATE_DIR") or script_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def batch_items(items: List[Tuple[str, Optional[str]]]) -> List[List[Tuple[str, Optional[str]]]]:
+    """Group queued (content, item_id) pairs into as few messages as fit within Zulip's length limit."""
+    batches = []
+    current: List[Tuple[str, Optional[str]]] = []
+    length = 0
+    for item in items:
+        added = len(item[0]) + (len(ITEM_SEPARATOR) if current else 0)
+        if current and length + added > ZULIP_MAX_MESSAGE_LENGTH:
+            batches.append(current)
+            current = [item]
+            length = len(item[0])
+        else:
+            current.append(item)
+            length += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def join_batch(batch: List[Tuple[str, Optional[str]]]) -> str:
+    """Render a batch from batch_items() as one Zulip message."""
+    return ITEM_SEPARATOR.join(content for content, _ in batch)
+
+
+class PostQueue:
+    """Zulip posts queued during a check cycle, sent per stream/topic in as few messages as fit.
+
+    An item's ID is passed to mark_seen only once the message carrying it
+    has been posted. Batches that fail to send stay queued for the next
+    flush instead of being dropped, and ``item_id in queue`` stays true
+    meanwhile so the item isn't queued a second time.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str, str], bool],
+        mark_seen: Callable[[str], None],
+        logger: logging.Logger,
+    ):
+        """
+        Args:
+            send: Posts (stream, topic, content), returning whether it was posted
+            mark_seen: Records an item ID as seen
+            logger: Logger for send failures
+        """
+        self._send = send
+        self._mark_seen = mark_seen
+        self._logger = logger
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, Optional[str]]]] = defaultdict(list)
+        self._queued_ids: Set[str] = set()
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._queued_ids
+
+    def add(self, stream: str, topic: str, content: str, item_id: Optional[str] = None):
+        """Queue an item for stream/topic, to be marked seen as item_id once posted."""
+        self._pending[(stream, topic)].append((content, item_id))
+        if item_id:
+            self._queued_ids.add(item_id)
+
+    def flush(self) -> bool:
+        """Post everything queued, returning True if nothing is left queued."""
+        pending, self._pending = self._pending, defaultdict(list)
+
+        for (stream, topic), items in pending.items():
+            for batch in batch_items(items):
+                try:
+                    posted = self._send(stream, topic, join_batch(batch))
+                except Exception as e:
+                    self._logger.error(f"Failed to send to Zulip: {e}")
+                    posted = False
+                if not posted:
+                    self._pending[(stream, topic)].extend(batch)
+                    continue
+                for _, item_id in batch:
+                    if item_id:
+                        self._queued_ids.discard(item_id)
+                        self._mark_seen(item_id)
+
+        return not self._pending
+
+
+def make_item_id(prefix: str, value: str) -> str:
+    """Build a seen-item ID from a URL or other key, stable across restarts.
+
+    Unlike the builtin hash(), which is salted per process, the digest is
+    the same every run, so persisted seen items keep matching.
+    """
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{prefix}_{digest}"
+
+
+def load_validators(cache_file: Path, logger: logging.Logger) -> Dict[str, Dict[str, str]]:
+    """Load per-URL ETag/Last-Modified validators from disk."""
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load HTTP cache validators: {e}")
+    return {}
+
+
+def save_validators(cache_file: Path, validators: Dict[str, Dict[str, str]], logger: logging.Logger):
+    """Save per-URL ETag/Last-Modified validators to disk."""
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(validators, f, indent=2)
+    except Exception as e:
+        logger.error(f"Failed to save HTTP cache validators: {e}")
+
+
+def conditional_headers(validators: Dict[str, Dict[str, str]], url: str) -> Dict[str, str]:
+    """Build If-None-Match/If-Modified-Since headers for a previously fetched URL."""
+    cached = validators.get(url, {})
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def remember_validators(validators: Dict[str, Dict[str, str]], url: str, headers):
+    """Store a response's validators once its content has been fully processed."""
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag or last_modified:
+        validators[url] = {"etag": etag or "", "last_modified": last_modified or ""}
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Rate limiting for Zulip news bots.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Allows bursts of up to ``capacity`` calls, then refills at ``rate``
+    tokens per second. acquire() only blocks once the bucket is empty, so
+    occasional posts go out immediately instead of after a fixed sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: int) -> "TokenBucket":
+        """Create a bucket allowing ``limit`` calls per minute, all of them in a burst."""
+        return cls(rate=limit / 60.0, capacity=limit)
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1
+                self._updated = time.monotonic()
+
+            self._tokens -= 1
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped Bloom filter for tracking seen items.
+"""
+
+import os
+import math
+import mmap
+import struct
+import hashlib
+import logging
+from pathlib import Path
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter stored in a memory-mapped file.
+
+    Lookups never miss an item that was added, so nothing is posted twice.
+    They can report false positives (about ``error_rate`` once ``capacity``
+    items are stored), which means a new item is very occasionally skipped -
+    an acceptable trade for a news feed in exchange for bounded memory and
+    a fixed-size state file that never has to be truncated.
+
+    The file holds two generations of the bit array. Items are added to the
+    current one; once it holds ``capacity`` items the other is cleared and
+    becomes current. Lookups check both, so every item is remembered for at
+    least ``capacity`` further additions, and the false-positive rate stays
+    below about twice ``error_rate`` however long the bot runs instead of
+    climbing towards 1 as a single filter fills up.
+
+    The bit arrays are read and written in place through a shared mapping,
+    so several bots can map the same file and see each other's items without
+    loading or saving it. Concurrent adds to the same byte can race, which
+    at worst forgets one item and lets it be posted again.
+    """
+
+    # Per generation: bit count, hash count, items added
+    HEADER = struct.Struct("<QIQ")
+    # After both generations: index of the current generation
+    TRAILER = struct.Struct("<I")
+    GENERATIONS = 2
+
+    def __init__(self, buf: mmap.mmap, capacity: int = 100_000):
+        self._buf = buf
+        self.capacity = capacity
+        self.num_bits, self.num_hashes, _ = self.HEADER.unpack_from(buf)
+        self._generation_size = self.HEADER.size + (self.num_bits + 7) // 8
+        if len(buf) != self._file_size(self.num_bits):
+            raise ValueError("Truncated Bloom filter file")
+
+        # Files written before generations were added hold a single
+        # generation; open() zero-extends them and the header is filled here
+        for generation in range(1, self.GENERATIONS):
+            offset = generation * self._generation_size
+            if self.HEADER.unpack_from(buf, offset)[0] == 0:
+                self.HEADER.pack_into(buf, offset, self.num_bits, self.num_hashes, 0)
+
+    @classmethod
+    def _file_size(cls, num_bits: int) -> int:
+        return cls.GENERATIONS * (cls.HEADER.size + (num_bits + 7) // 8) + cls.TRAILER.size
+
+    @classmethod
+    def open(cls, path: Union[str, Path], capacity: int = 100_000, error_rate: float = 1e-4) -> "BloomFilter":
+        """Map the filter stored at path, creating an empty one if the file is missing or empty.
+
+        error_rate only applies when a new filter is created; capacity also
+        sets how many items a generation holds before the filter rotates.
+        """
+        cls._check_not_directory(path)
+        with open(path, "a+b") as f:
+            size = os.fstat(f.fileno()).st_size
+            num_bits = cls._read_num_bits(f)
+            if size == 0:
+                cls._initialize(f, capacity, error_rate)
+            elif size == cls.HEADER.size + (num_bits + 7) // 8:
+                # Single-generation file: keep its bits as generation 0
+                f.truncate(cls._file_size(num_bits))
+            return cls(mmap.mmap(f.fileno(), 0), capacity)
+
+    @classmethod
+    def create(cls, path: Union[str, Path], capacity: int = 100_000, error_rate: float = 1e-4) -> "BloomFilter":
+        """Map a new, empty filter at path, replacing any existing contents.
+
+        The file is truncated in place rather than replaced so single-file
+        Docker volume mounts keep pointing at it.
+        """
+        cls._check_not_directory(path)
+        with open(path, "w+b") as f:
+            cls._initialize(f, capacity, error_rate)
+            return cls(mmap.mmap(f.fileno(), 0), capacity)
+
+    @staticmethod
+    def _check_not_directory(path: Union[str, Path]):
+        """Explain the usual cause of a directory where the filter file should be."""
+        if Path(path).is_dir():
+            raise IsADirectoryError(
+                f"{path} is a directory, not a Bloom filter file. Docker creates one when a "
+                "missing host file is bind-mounted; mount the bot's state directory instead."
+            )
+
+    @classmethod
+    def _read_num_bits(cls, f) -> int:
+        """Read the bit count from the header of an existing filter file."""
+        f.seek(0)
+        header = f.read(cls.HEADER.size)
+        return cls.HEADER.unpack(header)[0] if len(header) == cls.HEADER.size else 0
+
+    @classmethod
+    def _initialize(cls, f, capacity: int, error_rate: float):
+        """Write the header and zeroed bit arrays sized for capacity and error_rate."""
+        num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        f.write(cls.HEADER.pack(num_bits, num_hashes, 0))
+        f.truncate(cls._file_size(num_bits))
+        f.flush()
+
+    def _positions(self, item: str):
+        """Yield bit positions for item using Kirsch-Mitzenmacher double hashing."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def _count(self, generation: int) -> int:
+        return self.HEADER.unpack_from(self._buf, generation * self._generation_size)[2]
+
+    def __contains__(self, item: str) -> bool:
+        buf = self._buf
+        positions = list(self._positions(item))
+        for generation in range(self.GENERATIONS):
+            offset = generation * self._generation_size + self.HEADER.size
+            if all(buf[offset + (pos >> 3)] & (1 << (pos & 7)) for pos in positions):
+                return True
+        return False
+
+    def __len__(self) -> int:
+        """Number of items currently remembered, across both generations."""
+        return sum(self._count(generation) for generation in range(self.GENERATIONS))
+
+    def add(self, item: str):
+        """Add an item to the current generation, rotating first if it is full."""
+        if item in self:
+            return
+        buf = self._buf
+        trailer_offset = self.GENERATIONS * self._generation_size
+        generation = self.TRAILER.unpack_from(buf, trailer_offset)[0]
+        count = self._count(generation)
+        if count >= self.capacity:
+            logger.warning(
+                f"Seen items filter reached its capacity of {self.capacity}; "
+                "dropping the oldest generation"
+            )
+            generation = (generation + 1) % self.GENERATIONS
+            start = generation * self._generation_size + self.HEADER.size
+            buf[start:start + (self.num_bits + 7) // 8] = bytes((self.num_bits + 7) // 8)
+            count = 0
+            self.TRAILER.pack_into(buf, trailer_offset, generation)
+
+        base = generation * self._generation_size
+        offset = base + self.HEADER.size
+        for pos in self._positions(item):
+            buf[offset + (pos >> 3)] |= 1 << (pos & 7)
+        self.HEADER.pack_into(buf, base, self.num_bits, self.num_hashes, count + 1)
+
+    def flush(self):
+        """Write changed pages back to the file."""
+        self._buf.flush()
+
+    def close(self):
+        """Flush and unmap the filter."""
+        self._buf.flush()
+        self._buf.close()
@@ -186,10 +186,8 @@ class TwitterNewsBot(BaseNewsBot):
                     clean_content = clean_content[:500] + "..."
                 message += f"\n\n{clean_content}"
 
-        self._post_to_zulip(category, message)
-        self.mark_seen(item_id)
+        self._queue_to_zulip(category, message, item_id)
 
-        time.sleep(1)
         return True
 
     def _get_text(self, elem, path: str, ns: dict, attr: str = None):
@@ -245,7 +243,8 @@ class TwitterNewsBot(BaseNewsBot):
             self.logger.error(f"Failed to parse RSS feed: {e}")
             return
 
-        for item in root.findall(".//item"):
+        # Walk items lazily rather than collecting them all into a list first
+        for item in root.iter("item"):
             try:
                 self._process_google_news_item(item, query, max_age_hours)
             except Exception as e:
@@ -298,10 +297,7 @@ class TwitterNewsBot(BaseNewsBot):
             f"**URL:** {link}"
         )
 
-        self._post_to_zulip(category, content)
-        self.mark_seen(item_id)
-
-        time.sleep(1)
+        self._queue_to_zulip(category, content, item_id)
 
 
 def main():
@@ -145,11 +145,7 @@ class YouTubeNewsBot(BaseNewsBot):
                 desc_preview += "..."
             content += f"\n**Description:**\n{desc_preview}"
 
-        self._post_to_zulip(category, content)
-        self.mark_seen(item_id)
-
-        # Small delay between posts
-        time.sleep(1)
+        self._queue_to_zulip(category, content, item_id)
 
 
 def main():